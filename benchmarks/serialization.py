@@ -0,0 +1,89 @@
+"""Compare spec serialization with `apispec_webframeworks.serialization`
+against serializing with the standard library and `APISpec.to_yaml`.
+
+Run with ``python benchmarks/serialization.py [number of paths]``.
+"""
+
+import json
+import sys
+import timeit
+
+from apispec import APISpec
+
+from apispec_webframeworks import serialization
+
+
+def make_spec(n_paths: int) -> APISpec:
+    spec = APISpec(title="Benchmark", version="1.0.0", openapi_version="3.0.2")
+    for i in range(n_paths):
+        spec.path(
+            path=f"/resources{i}/{{resource_id}}",
+            operations={
+                method: {
+                    "summary": f"{method} resource {i}",
+                    "parameters": [
+                        {
+                            "in": "path",
+                            "name": "resource_id",
+                            "required": True,
+                            "schema": {"type": "integer", "minimum": 0},
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "A resource",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "id": {"type": "integer"},
+                                            "name": {"type": "string"},
+                                            "tags": {
+                                                "type": "array",
+                                                "items": {"type": "string"},
+                                            },
+                                        },
+                                    }
+                                }
+                            },
+                        }
+                    },
+                }
+                for method in ("get", "put", "delete")
+            },
+        )
+    return spec
+
+
+def bench(label: str, func, number: int) -> None:
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<40} {best * 1000:9.2f} ms")
+
+
+def main() -> None:
+    n_paths = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    spec = make_spec(n_paths)
+    data = spec.to_dict()
+    print(f"{n_paths} paths, JSON encoder: {serialization.JSON_ENCODER}")
+    print(f"YAML dumper: {serialization.YAMLDumper.__name__}")
+    print("JSON")
+    bench("json.dumps", lambda: json.dumps(data).encode("utf-8"), 10)
+    bench("to_json", lambda: serialization.to_json(data), 10)
+    bench(
+        "json.dumps(sort_keys=True)",
+        lambda: json.dumps(data, sort_keys=True).encode("utf-8"),
+        10,
+    )
+    bench(
+        "to_json(canonical=True)",
+        lambda: serialization.to_json(data, canonical=True),
+        10,
+    )
+    print("YAML")
+    bench("APISpec.to_yaml", lambda: spec.to_yaml().encode("utf-8"), 1)
+    bench("to_yaml", lambda: serialization.to_yaml(data), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Caches shared by the framework plugins.
+
+Plugin instances may be shared between threads (e.g. app factories building
+several specs at once), so any state they keep must be safe for concurrent
+use, including on free-threaded builds of Python.
+"""
+
+import weakref
+from collections.abc import Callable, Hashable, MutableMapping
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class ReadMostlyCache(Generic[K, V]):
+    """Memoizes ``factory(key)`` for keys that are looked up far more often
+    than they are added.
+
+    Hits are plain dictionary reads and never take a lock. On a miss the value
+    is computed outside of any lock and published with an atomic
+    ``dict.setdefault``, so callers racing on the same key may compute it more
+    than once but all of them observe the first value that was stored.
+    ``factory`` must therefore be a pure function of its key.
+
+    :param factory: Callable computing the value for a missing key.
+    :param bool weak: Hold keys by weak reference, so that the cache does not
+        keep them alive. Use it for keys such as classes and functions, whose
+        values are dropped when they are garbage collected.
+    """
+
+    __slots__ = ("_data", "_factory")
+
+    def __init__(self, factory: Callable[[K], V], *, weak: bool = False) -> None:
+        self._factory = factory
+        self._data: MutableMapping[K, V] = weakref.WeakKeyDictionary() if weak else {}
+
+    def __getitem__(self, key: K) -> V:
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+        return self._data.setdefault(key, self._factory(key))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -1,4 +1,5 @@
-"""Aiohttp plugin. Includes a path helper that allows you to pass an AbstractRoute.
+"""Aiohttp plugin. Includes a path helper that allows you to pass an AbstractRoute,
+or a `RouteRecord` generated by `AiohttpPlugin.route_records`.
 Takes the method from the route and docstring from the route handler.
 ::
 
@@ -6,6 +7,8 @@ Takes the method from the route and docstring from the route handler.
     from apispec import APISpec
     from pprint import pprint
 
+    from apispec_webframeworks.routes import RouteFilter
+
 
     async def hello(request):
         '''Get a greeting endpoint.
@@ -26,14 +29,11 @@ Takes the method from the route and docstring from the route handler.
     app.add_routes([web.get("/hello", hello)])
 
     # Add all aiohttp routes to the APISpec
-    for route in app.router.routes():
-        # Don't include HEAD mehods in OpenAPI spec
-        if route.method == "HEAD":
-            continue
-
-        spec.path(
-            route=route,
-        )
+    # Don't include HEAD methods in OpenAPI spec
+    plugin = AiohttpPlugin()
+    route_filter = RouteFilter(exclude_methods=["head"])
+    for record in plugin.route_records(app, route_filter=route_filter):
+        spec.path(record=record)
 
     pprint(spec.to_dict()["paths"])
     # {'/hello': {'get': {'description': 'Get a greeting',
@@ -43,13 +43,54 @@ Takes the method from the route and docstring from the route handler.
 
 """  # noqa: E501
 
+import re
+from collections.abc import Iterable, Iterator
 from typing import Any
 
-from aiohttp.web import AbstractRoute
-from apispec import BasePlugin, yaml_utils
+from aiohttp.web import AbstractRoute, Application
+from apispec import BasePlugin
+
+from . import docs
+from .routes import RouteFilter, RouteRecord
+
+RE_URL = re.compile(r"{([^{}:]+)(?::[^{}]*)?}")
 
 
 class AiohttpPlugin(BasePlugin):
+    @staticmethod
+    def _record_for_route(route: AbstractRoute) -> RouteRecord:
+        assert route.resource is not None
+        path = route.resource.canonical
+        return RouteRecord.create(
+            rule=path,
+            path=path,
+            methods=(route.method,),
+            handler=route.handler,
+            parameters=RE_URL.findall(path),
+            endpoint=route.name,
+        )
+
+    def route_records(
+        self,
+        routes: Application | Iterable[AbstractRoute],
+        route_filter: RouteFilter | None = None,
+    ) -> Iterator[RouteRecord]:
+        """Generate a `RouteRecord` for each route of an aiohttp app.
+
+        :param routes: aiohttp app, or routes such as ``app.router.routes()``.
+        :param RouteFilter route_filter: Routes and methods to include.
+        """
+        if isinstance(routes, Application):
+            routes = routes.router.routes()
+        records: Iterator[RouteRecord] = (
+            self._record_for_route(route)
+            for route in list(routes)
+            if route.resource is not None
+        )
+        if route_filter is not None:
+            records = route_filter.apply(records)
+        yield from records
+
     def path_helper(
         self,
         path: str | None = None,
@@ -57,14 +98,17 @@ class AiohttpPlugin(BasePlugin):
         parameters: list[dict] | None = None,
         *,
         route: AbstractRoute | None = None,
+        record: RouteRecord | None = None,
         **kwargs: Any,
     ) -> str | None:
-        """Path helper that allows passing a aiohttp AbstractRoute"""
+        """Path helper that allows passing a aiohttp AbstractRoute or a
+        `RouteRecord` generated by `route_records`.
+        """
         assert operations is not None
-        assert route is not None
 
-        docstring = route.handler.__doc__ or ""
-        operations.update(
-            {route.method.lower(): yaml_utils.load_yaml_from_docstring(docstring)}
-        )
-        return route.resource.canonical
+        if record is None:
+            assert route is not None
+            record = self._record_for_route(route)
+        for method in record.methods:
+            operations[method] = docs.load_yaml(record.handler)
+        return record.path
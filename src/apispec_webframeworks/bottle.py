@@ -26,30 +26,144 @@ a view function to `path`.
 """  # noqa: E501
 
 import re
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterator
 from typing import Any
 
-from apispec import BasePlugin, yaml_utils
+from apispec import APISpec, BasePlugin, yaml_utils
 from apispec.exceptions import APISpecError
 from bottle import Bottle, Route, default_app
 
+from . import docs
+from ._cache import ReadMostlyCache
+from .routes import (
+    RouteFilter,
+    RouteRecord,
+    RouteRegistry,
+    add_path_parameters,
+    path_parameters,
+)
+
 RE_URL = re.compile(r"<([^<>:]+):?[^>]*>")
+RE_WILDCARD = re.compile(
+    r"<([a-zA-Z_][a-zA-Z_0-9]*)(?::([a-zA-Z_]*)(?::((?:\\.|[^\\>])+)?)?)?>"
+)
+
+_openapi_paths: ReadMostlyCache[str, str] = ReadMostlyCache(
+    lambda path: RE_URL.sub(r"{\1}", path)
+)
 
 
 _default_app = default_app()
 
 
+#: Base schema of a wildcard filter, and function refining it from its config
+FilterSchema = tuple[dict, Callable[[dict, str | None], dict] | None]
+
+
+def _re_schema(schema: dict, config: str | None) -> dict:
+    if config:
+        schema["pattern"] = f"^(?:{config})$"
+    return schema
+
+
+class _RouteCapture:
+    """Bottle plugin recording routes as they are added to the app."""
+
+    name = "apispec_webframeworks"
+    api = 2
+
+    def __init__(self, plugin: "BottlePlugin", registry: RouteRegistry) -> None:
+        self.plugin = plugin
+        self.registry = registry
+
+    def setup(self, app: Bottle) -> None:
+        for record in self.plugin.route_records(app):
+            self.registry.add(record)
+        add_route = app.add_route
+
+        def capturing_add_route(route: Route) -> None:
+            add_route(route)
+            self.registry.add(self.plugin._record_for_route(route))
+
+        app.add_route = capturing_add_route  # type: ignore[method-assign]
+
+    def apply(self, callback: Callable[..., Any], route: Route) -> Callable[..., Any]:
+        return callback
+
+
 class BottlePlugin(BasePlugin):
-    """APISpec plugin for Bottle"""
+    """APISpec plugin for Bottle
+
+    :param bool path_parameters: Document the path parameters of each route,
+        with schemas derived from the wildcard filters (``<pet_id:int>``). Path
+        parameters declared in ``spec.path`` are kept as is. A plugin
+        documenting path parameters can only be shared between specs of the
+        same OpenAPI major version.
+    """
+
+    #: Schemas of the parameters of each wildcard filter. Unknown filters are
+    #: strings.
+    filter_schemas: dict[str, FilterSchema] = {
+        "default": ({"type": "string"}, None),
+        "int": ({"type": "integer"}, None),
+        "float": ({"type": "number"}, None),
+        "path": ({"type": "string"}, None),
+        "re": ({"type": "string"}, _re_schema),
+    }
+
+    def __init__(self, *, path_parameters: bool = False) -> None:
+        self.path_parameters = path_parameters
+        #: Version of the first spec using the plugin, the one parameters are
+        #: formatted for.
+        self.openapi_version: Any = None
+        self._version_lock = threading.Lock()
+        self._path_parameters: ReadMostlyCache[tuple[str, int], tuple[dict, ...]] = (
+            ReadMostlyCache(self._parameters_for_rule)
+        )
+
+    def init_spec(self, spec: APISpec) -> None:
+        super().init_spec(spec)
+        # Parameters are formatted for a single OpenAPI major version. The
+        # version is bound once, so path helpers running in other threads
+        # never see it change.
+        with self._version_lock:
+            if self.openapi_version is None:
+                self.openapi_version = spec.openapi_version
+                return
+        if (
+            self.path_parameters
+            and self.openapi_version.major != spec.openapi_version.major
+        ):
+            raise APISpecError(
+                f"BottlePlugin with path_parameters=True is already used by an "
+                f"OpenAPI {self.openapi_version} spec, it cannot be shared with "
+                f"an OpenAPI {spec.openapi_version} spec"
+            )
+
+    def _parameters_for_rule(self, key: tuple[str, int]) -> tuple[dict, ...]:
+        """Path parameters of a route rule, for an OpenAPI major version."""
+        rule, openapi_major_version = key
+        schemas = []
+        for name, filter_name, config in RE_WILDCARD.findall(rule):
+            schema, refine = self.filter_schemas.get(
+                filter_name or "default", ({"type": "string"}, None)
+            )
+            schema = dict(schema)
+            if refine is not None:
+                schema = refine(schema, config or None)
+            schemas.append((name, schema))
+        return path_parameters(schemas, openapi_major_version)
 
     @staticmethod
     def bottle_path_to_openapi(path: str) -> str:
-        return RE_URL.sub(r"{\1}", path)
+        return _openapi_paths[path]
 
     @staticmethod
     def _route_for_view(app: Bottle, view: Callable[..., Any]) -> Route:
         endpoint = None
-        for route in app.routes:
+        # Snapshot the routes, they may be added by other threads
+        for route in list(app.routes):
             if route.callback == view:
                 endpoint = route
                 break
@@ -57,6 +171,55 @@ class BottlePlugin(BasePlugin):
             raise APISpecError(f"Could not find endpoint for route {view}")
         return endpoint
 
+    @classmethod
+    def _record_for_route(cls, route: Route) -> RouteRecord:
+        return RouteRecord.create(
+            rule=route.rule,
+            path=cls.bottle_path_to_openapi(route.rule),
+            # Bottle serves every method on "ANY" routes
+            methods=yaml_utils.PATH_KEYS if route.method == "ANY" else (route.method,),
+            handler=route.callback,
+            parameters=RE_URL.findall(route.rule),
+            endpoint=route.name,
+        )
+
+    def route_records(
+        self, app: Bottle | None = None, route_filter: RouteFilter | None = None
+    ) -> Iterator[RouteRecord]:
+        """Generate a `RouteRecord` for each route of a Bottle app.
+
+        :param Bottle app: Bottle app, defaults to the default app.
+        :param RouteFilter route_filter: Routes and methods to include.
+        """
+        if app is None:
+            app = _default_app
+        records: Iterator[RouteRecord] = (
+            self._record_for_route(route) for route in list(app.routes)
+        )
+        if route_filter is not None:
+            records = route_filter.apply(records)
+        yield from records
+
+    def capture(
+        self, app: Bottle | None = None, registry: RouteRegistry | None = None
+    ) -> RouteRegistry:
+        """Record the routes of a Bottle app as they are declared, by
+        installing a Bottle plugin on the app.
+
+        Routes already declared are recorded right away. Routes declared
+        afterwards, including those merged from other apps, are recorded by
+        ``app.add_route``.
+
+        :param Bottle app: Bottle app, defaults to the default app.
+        :param RouteRegistry registry: Registry to fill, defaults to a new one.
+        """
+        if app is None:
+            app = _default_app
+        if registry is None:
+            registry = RouteRegistry()
+        app.install(_RouteCapture(self, registry))
+        return registry
+
     def path_helper(
         self,
         path: str | None = None,
@@ -64,14 +227,29 @@ class BottlePlugin(BasePlugin):
         parameters: list[dict] | None = None,
         *,
         view: Any | None = None,
+        record: RouteRecord | None = None,
         **kwargs: Any,
     ) -> str | None:
-        """Path helper that allows passing a bottle view function."""
+        """Path helper that allows passing a bottle view function or a
+        `RouteRecord` generated by `route_records`.
+
+        When passing a record, only the operations for the methods of the
+        record are documented.
+        """
         assert operations is not None
-        assert view is not None
 
-        docstring = view.__doc__ or ""
-        operations.update(yaml_utils.load_operations_from_docstring(docstring))
-        app = kwargs.get("app", _default_app)
-        route = self._route_for_view(app, view)
-        return self.bottle_path_to_openapi(route.rule)
+        if record is None:
+            assert view is not None
+            app = kwargs.get("app", _default_app)
+            record = self._record_for_route(self._route_for_view(app, view))
+            operations.update(docs.load_operations(record.handler))
+        else:
+            operations.update(
+                record.select_operations(docs.load_operations(record.handler))
+            )
+        if self.path_parameters and parameters is not None:
+            add_path_parameters(
+                parameters,
+                self._path_parameters[record.rule, self.openapi_version.major],
+            )
+        return record.path
@@ -0,0 +1,122 @@
+"""Declare OpenAPI data with a decorator instead of a YAML docstring.
+
+`doc` attaches the data the YAML section of the docstring would hold, so the
+plugins use it as is and never parse YAML for that object. What the data
+describes depends on what is decorated, exactly as for docstrings: the
+operations of a view, or a single operation for a method of a class-based
+view.
+::
+
+    from apispec_webframeworks.docs import doc
+
+
+    @app.route("/gists/<gist_id>")
+    @doc(get={"responses": {"200": {"description": "A gist"}}})
+    def gist_detail(gist_id):
+        return "detail for gist {}".format(gist_id)
+
+
+    class GistApi(MethodView):
+        @doc(responses={"200": {"description": "A list of gists"}})
+        def get(self):
+            pass
+
+Objects that are not decorated keep being documented by their docstring.
+"""
+
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from typing import Any, TypeVar
+
+from apispec import yaml_utils
+
+from ._cache import ReadMostlyCache
+
+ATTRIBUTE = "__apispec__"
+
+T = TypeVar("T")
+
+
+def doc(data: Mapping[str, Any] | None = None, **kwargs: Any) -> Callable[[T], T]:
+    """Decorator attaching OpenAPI data to a view, method or handler.
+
+    :param dict data: OpenAPI data, may be combined with keyword arguments.
+    :param kwargs: OpenAPI data.
+    """
+    declared = {**(data or {}), **kwargs}
+
+    def decorator(obj: T) -> T:
+        setattr(obj, ATTRIBUTE, declared)
+        return obj
+
+    return decorator
+
+
+def _parse_docstring(docstring: str) -> dict:
+    return yaml_utils.load_yaml_from_docstring(docstring)
+
+
+class DocstringCache(ReadMostlyCache[str, dict]):
+    """YAML parsed from docstrings, to be used with `cached_parsing`."""
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(_parse_docstring)
+
+
+_docstring_cache: ContextVar[DocstringCache | None] = ContextVar(
+    "apispec_webframeworks_docstring_cache", default=None
+)
+
+
+@contextmanager
+def cached_parsing(cache: DocstringCache) -> Iterator[DocstringCache]:
+    """Parse each docstring at most once within the block, storing the result
+    in ``cache``. Reusing the cache across blocks, e.g. to build several specs
+    from the same routes, parses each docstring only once overall.
+
+    :param DocstringCache cache: Parsed docstrings.
+    """
+    token = _docstring_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _docstring_cache.reset(token)
+
+
+def _declared(obj: Any) -> dict | None:
+    # Classes don't inherit the data of their bases, as with docstrings
+    if isinstance(obj, type):
+        return vars(obj).get(ATTRIBUTE)
+    return getattr(obj, ATTRIBUTE, None)
+
+
+def load_yaml(obj: Any) -> dict:
+    """Return the OpenAPI data declared with `doc`, or else loaded from the
+    YAML section of the docstring of an object.
+    """
+    declared = _declared(obj)
+    if declared is not None:
+        # apispec mutates operations in place
+        return deepcopy(declared)
+    docstring = obj.__doc__ or ""
+    if "---" not in docstring:
+        return {}
+    cache = _docstring_cache.get()
+    if cache is None:
+        return yaml_utils.load_yaml_from_docstring(docstring)
+    return deepcopy(cache[docstring])
+
+
+def load_operations(obj: Any) -> dict:
+    """Return the OpenAPI operations declared on an object, as `load_yaml`,
+    keeping only operations and extensions.
+    """
+    return {
+        key: val
+        for key, val in load_yaml(obj).items()
+        if key in yaml_utils.PATH_KEYS or key.startswith("x-")
+    }
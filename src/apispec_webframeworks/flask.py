@@ -69,18 +69,44 @@ Passing a method view function::
     #             'post': {},
     #             'x-extension': 'metadata'}}
 
+Serving the spec::
+
+    from apispec_webframeworks.flask import spec_blueprint
+
+
+    def create_spec():
+        spec = APISpec(...)
+        for record in plugin.route_records():
+            spec.path(record=record)
+        return spec
+
+
+    # Serves /openapi.json and /openapi.yaml, building the spec on first request
+    app.register_blueprint(spec_blueprint(create_spec))
 
 """  # noqa: E501
 
 import re
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterator
 from typing import TYPE_CHECKING, Any, Union
 
-from apispec import BasePlugin, yaml_utils
+from apispec import APISpec, BasePlugin
 from apispec.exceptions import APISpecError
-from flask import Flask, current_app
+from flask import Blueprint, Flask, Response, current_app, request
 from flask.views import MethodView
-from werkzeug.routing import Rule
+from werkzeug.routing import Rule, parse_converter_args
+
+from . import docs
+from ._cache import ReadMostlyCache
+from .routes import (
+    RouteFilter,
+    RouteRecord,
+    RouteRegistry,
+    add_path_parameters,
+    path_parameters,
+)
+from .serving import ENCODINGS, CachedSpec, MappedSpec
 
 if TYPE_CHECKING:
     from flask.typing import RouteCallable
@@ -89,9 +115,140 @@ if TYPE_CHECKING:
 # from flask-restplus
 RE_URL = re.compile(r"<(?:[^:<>]+:)?([^<>]+)>")
 
+RE_RULE_VARIABLE = re.compile(
+    r"<(?:(?P<converter>[a-zA-Z_][a-zA-Z0-9_]*)(?:\((?P<args>.*?)\))?:)?"
+    r"(?P<variable>[a-zA-Z_][a-zA-Z0-9_]*)>"
+)
+
+_openapi_paths: ReadMostlyCache[str, str] = ReadMostlyCache(
+    lambda path: RE_URL.sub(r"{\1}", path)
+)
+
+
+#: Base schema of a URL converter, and function refining it from its arguments
+ConverterSchema = tuple[dict, Callable[..., dict] | None]
+
+
+def _number_schema(
+    schema: dict,
+    min: float | None = None,
+    max: float | None = None,
+    signed: bool = False,
+    **kwargs: Any,
+) -> dict:
+    if min is not None:
+        schema["minimum"] = min
+    elif not signed:
+        schema["minimum"] = 0
+    if max is not None:
+        schema["maximum"] = max
+    return schema
+
+
+def _integer_schema(
+    schema: dict,
+    fixed_digits: int = 0,
+    min: int | None = None,
+    max: int | None = None,
+    signed: bool = False,
+    **kwargs: Any,
+) -> dict:
+    if fixed_digits and max is None:
+        # Values are zero-padded to that many digits
+        max = 10**fixed_digits - 1
+    return _number_schema(schema, min, max, signed)
+
+
+def _string_schema(
+    schema: dict,
+    minlength: int = 1,
+    maxlength: int | None = None,
+    length: int | None = None,
+    **kwargs: Any,
+) -> dict:
+    if length is not None:
+        minlength = maxlength = length
+    schema["minLength"] = minlength
+    if maxlength is not None:
+        schema["maxLength"] = maxlength
+    return schema
+
+
+def _any_schema(schema: dict, *items: str, **kwargs: Any) -> dict:
+    schema["enum"] = list(items)
+    return schema
+
 
 class FlaskPlugin(BasePlugin):
-    """APISpec plugin for Flask"""
+    """APISpec plugin for Flask
+
+    :param bool path_parameters: Document the path parameters of each route,
+        with schemas derived from the URL converters (``<int:pet_id>``). Path
+        parameters declared in ``spec.path`` are kept as is. A plugin
+        documenting path parameters can only be shared between specs of the
+        same OpenAPI major version.
+    """
+
+    #: Schemas of the parameters of each URL converter. Unknown converters are
+    #: strings.
+    converter_schemas: dict[str, ConverterSchema] = {
+        "default": ({"type": "string"}, _string_schema),
+        "string": ({"type": "string"}, _string_schema),
+        "path": ({"type": "string"}, None),
+        "any": ({"type": "string"}, _any_schema),
+        "int": ({"type": "integer"}, _integer_schema),
+        "float": ({"type": "number"}, _number_schema),
+        "uuid": ({"type": "string", "format": "uuid"}, None),
+    }
+
+    def __init__(self, *, path_parameters: bool = False) -> None:
+        self.path_parameters = path_parameters
+        #: Version of the first spec using the plugin, the one parameters are
+        #: formatted for.
+        self.openapi_version: Any = None
+        self._version_lock = threading.Lock()
+        self._path_parameters: ReadMostlyCache[tuple[str, int], tuple[dict, ...]] = (
+            ReadMostlyCache(self._parameters_for_rule)
+        )
+
+    def init_spec(self, spec: APISpec) -> None:
+        super().init_spec(spec)
+        # Parameters are formatted for a single OpenAPI major version. The
+        # version is bound once, so path helpers running in other threads
+        # never see it change.
+        with self._version_lock:
+            if self.openapi_version is None:
+                self.openapi_version = spec.openapi_version
+                return
+        if (
+            self.path_parameters
+            and self.openapi_version.major != spec.openapi_version.major
+        ):
+            raise APISpecError(
+                f"FlaskPlugin with path_parameters=True is already used by an "
+                f"OpenAPI {self.openapi_version} spec, it cannot be shared with "
+                f"an OpenAPI {spec.openapi_version} spec"
+            )
+
+    def _parameters_for_rule(self, key: tuple[str, int]) -> tuple[dict, ...]:
+        """Path parameters of a URL rule, for an OpenAPI major version."""
+        rule, openapi_major_version = key
+        schemas = []
+        for match in RE_RULE_VARIABLE.finditer(rule):
+            converter = match.group("converter") or "default"
+            schema, refine = self.converter_schemas.get(
+                converter, ({"type": "string"}, None)
+            )
+            schema = dict(schema)
+            if refine is not None:
+                args, kwargs = (
+                    parse_converter_args(match.group("args"))
+                    if match.group("args")
+                    else ((), {})
+                )
+                schema = refine(schema, *args, **kwargs)
+            schemas.append((match.group("variable"), schema))
+        return path_parameters(schemas, openapi_major_version)
 
     @staticmethod
     def flaskpath2openapi(path: str) -> str:
@@ -99,7 +256,7 @@ class FlaskPlugin(BasePlugin):
 
         :param str path: Flask path template.
         """
-        return RE_URL.sub(r"{\1}", path)
+        return _openapi_paths[path]
 
     @staticmethod
     def _rule_for_view(
@@ -109,9 +266,10 @@ class FlaskPlugin(BasePlugin):
         if app is None:
             app = current_app
 
-        view_funcs = app.view_functions
+        # Snapshot the view functions, routes may be added by other threads
+        view_funcs = list(app.view_functions.items())
         endpoint = None
-        for ept, view_func in view_funcs.items():
+        for ept, view_func in view_funcs:
             if view_func == view:
                 endpoint = ept
         if not endpoint:
@@ -121,6 +279,104 @@ class FlaskPlugin(BasePlugin):
         rule = app.url_map._rules_by_endpoint[endpoint][0]
         return rule
 
+    @classmethod
+    def _record_for_rule(
+        cls, rule: Rule, view: Union[Callable[..., Any], "RouteCallable"]
+    ) -> RouteRecord:
+        return RouteRecord.create(
+            rule=rule.rule,
+            path=cls.flaskpath2openapi(rule.rule),
+            methods=rule.methods or (),
+            handler=view,
+            parameters=RE_URL.findall(rule.rule),
+            endpoint=rule.endpoint,
+        )
+
+    def route_records(
+        self, app: Flask | None = None, route_filter: RouteFilter | None = None
+    ) -> Iterator[RouteRecord]:
+        """Generate a `RouteRecord` for each URL rule of a Flask app.
+
+        :param Flask app: Flask app, defaults to the current app.
+        :param RouteFilter route_filter: Routes and methods to include.
+        """
+        if app is None:
+            app = current_app
+        view_funcs = app.view_functions
+        records: Iterator[RouteRecord] = (
+            self._record_for_rule(rule, view_funcs[rule.endpoint])
+            for rule in list(app.url_map.iter_rules())
+            if rule.endpoint in view_funcs
+        )
+        if route_filter is not None:
+            records = route_filter.apply(records)
+        yield from records
+
+    def capture(
+        self, app: Flask, registry: RouteRegistry | None = None
+    ) -> RouteRegistry:
+        """Record the routes of a Flask app as they are declared.
+
+        Routes already declared are recorded right away. Routes declared
+        afterwards, including those of blueprints registered afterwards, are
+        recorded by ``app.add_url_rule``, once their view function is mapped.
+
+        :param Flask app: Flask app.
+        :param RouteRegistry registry: Registry to fill, defaults to a new one.
+        """
+        if registry is None:
+            registry = RouteRegistry()
+        for record in self.route_records(app):
+            registry.add(record)
+
+        # Rules are added to the map before their view function is mapped,
+        # which may even happen later on, with ``app.endpoint``
+        pending: list[Rule] = []
+        lock = threading.Lock()
+        map_add = app.url_map.add
+        add_url_rule = app.add_url_rule
+
+        def capturing_map_add(rulefactory: Any) -> None:
+            map_add(rulefactory)
+            if isinstance(rulefactory, Rule):
+                with lock:
+                    pending.append(rulefactory)
+
+        def resolve() -> list[RouteRecord]:
+            view_funcs = app.view_functions
+            with lock:
+                ready = [rule for rule in pending if rule.endpoint in view_funcs]
+                pending[:] = [
+                    rule for rule in pending if rule.endpoint not in view_funcs
+                ]
+            return [
+                self._record_for_rule(rule, view_funcs[rule.endpoint]) for rule in ready
+            ]
+
+        def capturing_add_url_rule(*args: Any, **kwargs: Any) -> None:
+            add_url_rule(*args, **kwargs)
+            for record in resolve():
+                registry.add(record)
+
+        registry.add_resolver(resolve)
+        app.url_map.add = capturing_map_add  # type: ignore[method-assign]
+        app.add_url_rule = capturing_add_url_rule  # type: ignore[method-assign]
+        return registry
+
+    @staticmethod
+    def _operations_for_record(record: RouteRecord) -> dict:
+        view = record.handler
+        if hasattr(view, "view_class") and issubclass(view.view_class, MethodView):  # noqa: E501
+            operations = docs.load_operations(view.view_class)
+            for method in view.methods:
+                method_name = method.lower()
+                if method_name in record.methods:
+                    method = getattr(view.view_class, method_name)
+                    operations[method_name] = docs.load_yaml(method)
+        else:
+            operations = docs.load_operations(view)
+        return operations
+
     def path_helper(
         self,
         path: str | None = None,
@@ -129,24 +385,109 @@ class FlaskPlugin(BasePlugin):
         *,
         view: Union[Callable[..., Any], "RouteCallable"] | None = None,
         app: Flask | None = None,
+        record: RouteRecord | None = None,
         **kwargs: Any,
     ) -> str | None:
-        """Path helper that allows passing a Flask view function."""
-        assert view is not None
+        """Path helper that allows passing a Flask view function or a
+        `RouteRecord` generated by `route_records`.
+
+        When passing a record, only the operations for the methods of the
+        record are documented.
+        """
         assert operations is not None
 
-        rule = self._rule_for_view(view, app=app)
-        view_doc = view.__doc__ or ""
-        doc_operations = yaml_utils.load_operations_from_docstring(view_doc)
-        operations.update(doc_operations)
-        if hasattr(view, "view_class") and issubclass(view.view_class, MethodView):  # noqa: E501
-            # method attribute is dynamically added, which is supported by mypy
-            for method in view.methods:  # type:ignore[union-attr]
-                if rule.methods and method in rule.methods:
-                    method_name = method.lower()
-                    method = getattr(view.view_class, method_name)
-                    method_docstring = method.__doc__ or ""
-                    operations[method_name] = yaml_utils.load_yaml_from_docstring(  # noqa: E501
-                        method_docstring
-                    )
-        return self.flaskpath2openapi(rule.rule)
+        if record is None:
+            assert view is not None
+            record = self._record_for_rule(self._rule_for_view(view, app=app), view)
+            operations.update(self._operations_for_record(record))
+        else:
+            operations.update(
+                record.select_operations(self._operations_for_record(record))
+            )
+        if self.path_parameters and parameters is not None:
+            add_path_parameters(
+                parameters,
+                self._path_parameters[record.rule, self.openapi_version.major],
+            )
+        return record.path
+
+
+def _spec_response(
+    body: Any, mimetype: str, etag: str, encoding: str | None = None
+) -> Response:
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=mimetype)
+        if encoding is not None:
+            response.content_encoding = encoding
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def spec_blueprint(
+    spec: APISpec | Callable[[], APISpec] | MappedSpec,
+    *,
+    name: str = "openapi",
+    json_url: str | None = "/openapi.json",
+    yaml_url: str | None = "/openapi.yaml",
+    **kwargs: Any,
+) -> Blueprint:
+    """Return a blueprint serving a spec as JSON and YAML.
+
+    The spec is built and serialized once, on first request, then served from
+    bytes kept in memory along with compressed copies (gzip, and brotli if
+    installed) picked from the ``Accept-Encoding`` request header. Responses
+    carry an ETag of the content, and conditional requests get a 304.
+
+    Passing a `MappedSpec` serves the spec straight from the memory map,
+    uncompressed, so that prefork workers share one copy of it. It is only
+    served at the URL of its format.
+
+    :param spec: Spec, callable returning the spec (called within the first
+        request, with an app context), or `MappedSpec`.
+    :param str name: Blueprint name.
+    :param str json_url: URL of the JSON spec, `None` to disable it.
+    :param str yaml_url: URL of the YAML spec, `None` to disable it.
+    :param kwargs: Passed to `flask.Blueprint`, e.g. ``url_prefix``.
+    """
+    blueprint = Blueprint(name, __name__, **kwargs)
+
+    if isinstance(spec, MappedSpec):
+        mapped = spec
+
+        def mapped_view() -> Response:
+            response = _spec_response(
+                mapped.iter_chunks(), mapped.mimetype, mapped.etag
+            )
+            if response.status_code == 200:
+                response.content_length = len(mapped)
+            return response
+
+        url = json_url if mapped.fmt == "json" else yaml_url
+        if url is not None:
+            blueprint.add_url_rule(url, mapped.fmt, mapped_view)
+        return blueprint
+
+    cached = CachedSpec(spec)
+
+    def make_view(fmt: str) -> Callable[[], Response]:
+        def view() -> Response:
+            serialized = cached.get(fmt)
+            encoding = request.accept_encodings.best_match(ENCODINGS)
+            return _spec_response(
+                serialized.encoded(encoding),
+                serialized.mimetype,
+                serialized.etag_for(encoding),
+                encoding,
+            )
+
+        return view
+
+    if json_url is not None:
+        blueprint.add_url_rule(json_url, "json", make_view("json"))
+    if yaml_url is not None:
+        blueprint.add_url_rule(yaml_url, "yaml", make_view("yaml"))
+    return blueprint
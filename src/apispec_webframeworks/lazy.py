@@ -0,0 +1,73 @@
+"""Defer loading operations until the spec is serialized.
+
+`LazyAPISpec.lazy_path` records a path without calling the plugins, so
+docstrings are only parsed the first time the spec is serialized, if ever.
+Combined with route records, app startup only pays for route discovery::
+
+    from apispec_webframeworks.flask import FlaskPlugin
+    from apispec_webframeworks.lazy import LazyAPISpec
+
+    plugin = FlaskPlugin()
+    spec = LazyAPISpec(
+        title="Gisty", version="1.0.0", openapi_version="3.0.2", plugins=[plugin]
+    )
+    for record in plugin.route_records(app):
+        spec.lazy_path(record=record)
+
+    # Docstrings are parsed here, once
+    spec.to_dict()
+"""
+
+import threading
+from typing import Any
+
+from apispec import APISpec
+
+
+class LazyAPISpec(APISpec):
+    """`APISpec` whose paths may be added lazily with `lazy_path`.
+
+    Pending paths are loaded, in the order they were added, the first time
+    the spec is serialized with `to_dict` or `to_yaml`. Loading is done once
+    and under a lock, so a spec shared between threads is never serialized
+    half loaded.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending_paths: list[dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+
+    def lazy_path(self, path: str | None = None, **kwargs: Any) -> "LazyAPISpec":
+        """Add a path to the spec, deferring the work of `APISpec.path` until
+        the spec is serialized.
+
+        Takes the same arguments as `APISpec.path`.
+        """
+        with self._pending_lock:
+            self._pending_paths.append({"path": path, **kwargs})
+        return self
+
+    @property
+    def pending_paths(self) -> int:
+        """Number of paths waiting to be loaded."""
+        return len(self._pending_paths)
+
+    def load_paths(self) -> None:
+        """Load all pending paths now."""
+        if not self._pending_paths:
+            return
+        with self._pending_lock:
+            pending = self._pending_paths
+            for index, kwargs in enumerate(pending):
+                try:
+                    self.path(**kwargs)
+                except BaseException:
+                    # Keep the failing path so that the error is raised again
+                    self._pending_paths = pending[index:]
+                    raise
+            self._pending_paths = []
+
+    def to_dict(self) -> dict[str, Any]:
+        self.load_paths()
+        return super().to_dict()
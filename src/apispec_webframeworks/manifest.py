@@ -0,0 +1,177 @@
+"""Detect API contract changes without generating the spec.
+
+A `RouteManifest` maps each operation, as a ``(path, method)`` pair, to a
+hash of what the plugins document it from: the route rule, and the
+docstrings and `doc` data of the view, class-based view or handler method.
+Comparing the manifests of two versions of an app lists the operations that
+may have changed, so only those need to be generated and compared in full::
+
+    import json
+
+    from apispec_webframeworks.flask import FlaskPlugin
+    from apispec_webframeworks.manifest import RouteManifest
+
+    records = list(FlaskPlugin().route_records(app))
+    manifest = RouteManifest.from_records(records)
+
+    with open("manifest.json") as f:
+        previous = RouteManifest.from_dict(json.load(f))
+    diff = previous.compare(manifest)
+    for record in diff.records(records):
+        spec.path(record=record)
+
+Hashes cover the routes only: changes to schemas or plugins registered on the
+spec are not detected. A docstring documenting several methods is part of the
+hash of each of them.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, NamedTuple
+
+from . import docs
+from .routes import RouteRecord
+from .serialization import _str_keys
+
+#: Key of an operation in a manifest
+Operation = tuple[str, str]
+
+
+def _sources(handler: Any, method: str) -> Iterator[Any]:
+    """Objects whose docstring or `doc` data may document an operation."""
+    yield handler
+    view_class = getattr(handler, "view_class", handler)
+    if view_class is not handler:
+        yield view_class
+    if isinstance(view_class, type):
+        method_func = getattr(view_class, method, None)
+        if method_func is not None:
+            yield method_func
+
+
+def _fingerprint(obj: Any) -> str:
+    declared = docs._declared(obj)
+    if declared is not None:
+        # Keys may mix types, e.g. 200 and "default" responses
+        return json.dumps(_str_keys(declared), sort_keys=True, default=repr)
+    return obj.__doc__ or ""
+
+
+class ManifestDiff(NamedTuple):
+    """Operations that differ between two manifests."""
+
+    #: Operations only in the new manifest.
+    added: frozenset[Operation]
+    #: Operations only in the old manifest.
+    removed: frozenset[Operation]
+    #: Operations in both manifests, with different hashes.
+    changed: frozenset[Operation]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def records(self, records: Iterable[RouteRecord]) -> Iterator[RouteRecord]:
+        """Narrow records down to the added and changed operations, e.g. to
+        generate only those.
+
+        :param records: Records the new manifest was built from.
+        """
+        selected = self.added | self.changed
+        for record in records:
+            methods = tuple(
+                method for method in record.methods if (record.path, method) in selected
+            )
+            if methods:
+                yield (
+                    record
+                    if methods == record.methods
+                    else record._replace(methods=methods)
+                )
+
+
+class RouteManifest(Mapping[Operation, str]):
+    """Hash of each operation of an app, keyed by ``(path, method)``.
+
+    Use `RouteManifest.from_records` to build a manifest from the records of
+    any plugin.
+
+    :param hashes: Hash of each operation.
+    """
+
+    __slots__ = ("_hashes",)
+
+    def __init__(self, hashes: Mapping[Operation, str]) -> None:
+        self._hashes = dict(hashes)
+
+    @classmethod
+    def from_records(cls, records: Iterable[RouteRecord]) -> "RouteManifest":
+        """Build a manifest from records produced by a plugin's
+        ``route_records``.
+
+        :param records: Route records.
+        """
+        hashes: dict[Operation, Any] = {}
+        for record in records:
+            for method in record.methods:
+                key = (record.path, method)
+                if key not in hashes:
+                    hashes[key] = hashlib.sha256()
+                # Several rules may share a path, as in the spec
+                parts = [record.rule, method]
+                parts.extend(
+                    _fingerprint(obj) for obj in _sources(record.handler, method)
+                )
+                hashes[key].update("\0".join(parts).encode("utf-8") + b"\0\0")
+        return cls({key: digest.hexdigest()[:32] for key, digest in hashes.items()})
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Mapping[str, str]]) -> "RouteManifest":
+        """Load a manifest serialized with `to_dict`."""
+        return cls(
+            {
+                (path, method): digest
+                for path, methods in data.items()
+                for method, digest in methods.items()
+            }
+        )
+
+    def to_dict(self) -> dict[str, dict[str, str]]:
+        """Serialize the manifest as ``{path: {method: hash}}``, e.g. to store
+        it as JSON.
+        """
+        data: dict[str, dict[str, str]] = {}
+        for (path, method), digest in sorted(self._hashes.items()):
+            data.setdefault(path, {})[method] = digest
+        return data
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the whole manifest, e.g. as a cache key for a spec."""
+        digest = hashlib.sha256()
+        for (path, method), operation_hash in sorted(self._hashes.items()):
+            digest.update(f"{path}\0{method}\0{operation_hash}\0".encode())
+        return digest.hexdigest()[:32]
+
+    def compare(self, other: "RouteManifest") -> ManifestDiff:
+        """List the operations changed from this manifest to ``other``.
+
+        :param RouteManifest other: Newer manifest.
+        """
+        old, new = self._hashes, other._hashes
+        return ManifestDiff(
+            added=frozenset(new.keys() - old.keys()),
+            removed=frozenset(old.keys() - new.keys()),
+            changed=frozenset(
+                key for key in old.keys() & new.keys() if old[key] != new[key]
+            ),
+        )
+
+    def __getitem__(self, key: Operation) -> str:
+        return self._hashes[key]
+
+    def __iter__(self) -> Iterator[Operation]:
+        return iter(self._hashes)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
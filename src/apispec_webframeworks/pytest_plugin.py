@@ -0,0 +1,146 @@
+"""pytest plugin building specs once per test session.
+
+Enable it in a ``conftest.py``::
+
+    pytest_plugins = ["apispec_webframeworks.pytest_plugin"]
+
+and build the spec of each app through the ``apispec_cache`` fixture::
+
+    @pytest.fixture(scope="session")
+    def openapi(apispec_cache):
+        app = create_app()
+        return apispec_cache.get(
+            "petstore",
+            lambda: build_spec(app),
+            records=FlaskPlugin().route_records(app),
+        )
+
+
+    def test_get_pet(openapi):
+        assert "/pets/{pet_id}" in openapi["paths"]
+
+Tests receive a read-only view of the spec, as it is served as JSON, so one
+test cannot alter the spec seen by the others. Views are dicts and lists, so
+they can be serialized, e.g. with `json.dumps`, and `copy.deepcopy` returns a
+mutable copy.
+
+When ``records`` are given, the spec is also stored in the pytest cache
+(``.pytest_cache``) along with the `RouteManifest` fingerprint of the routes,
+and later sessions reuse it as long as the routes and their docstrings are
+unchanged. The fingerprint does not cover schemas or plugins registered on the
+spec: change the name of the spec, or run pytest with ``--cache-clear``, when
+those change.
+"""
+
+import json
+from collections.abc import Callable, Iterable, Mapping
+from copy import deepcopy
+from typing import Any, NoReturn
+
+import pytest
+from apispec import APISpec
+
+from .manifest import RouteManifest
+from .routes import RouteRecord
+
+CACHE_PREFIX = "apispec_webframeworks/"
+
+
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError("Spec views are read-only")
+
+
+class _ReadOnlyDict(dict):
+    """Dict raising `TypeError` on modification. Being a dict, it can be
+    serialized, and copies made with `copy.deepcopy` are mutable.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return {key: deepcopy(val, memo) for key, val in self.items()}
+
+
+class _ReadOnlyList(list):
+    """List raising `TypeError` on modification, see `_ReadOnlyDict`."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [deepcopy(item, memo) for item in self]
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return _ReadOnlyDict((key, _freeze(val)) for key, val in obj.items())
+    if isinstance(obj, list):
+        return _ReadOnlyList(_freeze(item) for item in obj)
+    return obj
+
+
+class SpecCache:
+    """Specs built once per test session, and persisted across sessions.
+
+    :param cache: pytest cache, if enabled.
+    """
+
+    def __init__(self, cache: pytest.Cache | None = None) -> None:
+        self._cache = cache
+        self._specs: dict[str, Mapping[str, Any]] = {}
+        #: Names of the specs built in this session, rather than loaded.
+        self.built: list[str] = []
+
+    def get(
+        self,
+        name: str,
+        factory: Callable[[], APISpec],
+        *,
+        records: Iterable[RouteRecord] | None = None,
+    ) -> Mapping[str, Any]:
+        """Return a read-only view of a spec, building it on first use.
+
+        :param str name: Name of the spec, unique within the test suite.
+        :param factory: Callable returning the spec.
+        :param records: Records of the routes the spec documents. If given,
+            the spec is persisted and reused by later sessions while the
+            routes are unchanged.
+        """
+        try:
+            return self._specs[name]
+        except KeyError:
+            pass
+        fingerprint = None
+        data = None
+        if records is not None and self._cache is not None:
+            fingerprint = RouteManifest.from_records(records).fingerprint
+            cached = self._cache.get(CACHE_PREFIX + name, None)
+            if cached is not None and cached.get("fingerprint") == fingerprint:
+                data = cached["spec"]
+        if data is None:
+            data = json.loads(json.dumps(factory().to_dict()))
+            self.built.append(name)
+            if fingerprint is not None:
+                assert self._cache is not None
+                self._cache.set(
+                    CACHE_PREFIX + name, {"fingerprint": fingerprint, "spec": data}
+                )
+        view = self._specs[name] = _freeze(data)
+        return view
+
+
+@pytest.fixture(scope="session")
+def apispec_cache(pytestconfig: pytest.Config) -> SpecCache:
+    """Specs built once per session, see `SpecCache`."""
+    return SpecCache(getattr(pytestconfig, "cache", None))
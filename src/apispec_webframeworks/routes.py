@@ -0,0 +1,400 @@
+"""Framework-independent description of the routes found by the plugins.
+
+Every plugin can turn the routes of its framework into `RouteRecord` objects,
+e.g. ``FlaskPlugin().route_records(app)``. Records can be passed back to any
+of the path helpers with ``spec.path(record=record)``, which skips looking up
+the route again. `RouteFilter` selects which records to document, and
+`RouteScan` builds several specs from the same routes. `RouteRegistry` holds
+records captured as routes are declared, by ``FlaskPlugin.capture`` and
+``BottlePlugin.capture``.
+"""
+
+import fnmatch
+import re
+import sys
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from copy import deepcopy
+from typing import Any, NamedTuple
+
+from apispec import APISpec, yaml_utils
+
+from . import docs
+
+
+def _intern_all(strings: Iterable[str]) -> tuple[str, ...]:
+    return tuple(sys.intern(string) for string in strings)
+
+
+class RouteRecord(NamedTuple):
+    """Facts about a single route, as extracted by a framework plugin.
+
+    Records are tuples, so they carry no per-instance dictionary, and the
+    strings they hold are interned: a spec of tens of thousands of routes
+    shares one copy of every path, method and parameter name. Docstrings and
+    `doc` data are read from the handler (or its methods) when operations are
+    loaded.
+
+    Use `RouteRecord.create` rather than instantiating the tuple directly.
+    """
+
+    #: Route as declared in the framework (URL rule, regex or path).
+    rule: str
+    #: OpenAPI path template, e.g. ``/pets/{pet_id}``.
+    path: str
+    #: Lowercase HTTP methods served by the route.
+    methods: tuple[str, ...]
+    #: View function, callback, handler class or coroutine serving the route.
+    handler: Any
+    #: Names of the path parameters, in the order they appear in ``path``.
+    parameters: tuple[str, ...]
+    #: Name of the route in the framework (endpoint, route name), if any.
+    endpoint: str | None = None
+
+    @classmethod
+    def create(
+        cls,
+        rule: str,
+        path: str,
+        methods: Iterable[str],
+        handler: Any,
+        parameters: Iterable[str] = (),
+        endpoint: str | None = None,
+    ) -> "RouteRecord":
+        """Build a record, normalizing methods and interning strings.
+
+        :param str rule: Route as declared in the framework.
+        :param str path: OpenAPI path template.
+        :param methods: HTTP methods served by the route, in any case.
+        :param handler: Object serving the route.
+        :param parameters: Names of the path parameters.
+        :param str endpoint: Name of the route in the framework.
+        """
+        return cls(
+            sys.intern(rule),
+            sys.intern(path),
+            _intern_all(sorted({method.lower() for method in methods})),
+            handler,
+            _intern_all(parameters),
+            sys.intern(endpoint) if endpoint is not None else None,
+        )
+
+    def select_operations(self, operations: dict) -> dict:
+        """Drop the operations for HTTP methods the route does not serve.
+
+        :param dict operations: Operations and extensions of the path.
+        """
+        return {
+            key: val
+            for key, val in operations.items()
+            if key not in yaml_utils.PATH_KEYS or key in self.methods
+        }
+
+
+def path_parameters(
+    schemas: Iterable[tuple[str, dict]], openapi_major_version: int
+) -> tuple[dict, ...]:
+    """Build OpenAPI path parameter objects.
+
+    :param schemas: Pairs of parameter name and schema.
+    :param int openapi_major_version: Major version of the OpenAPI spec.
+    """
+    if openapi_major_version < 3:
+        return tuple(
+            {"in": "path", "name": name, "required": True, **schema}
+            for name, schema in schemas
+        )
+    return tuple(
+        {"in": "path", "name": name, "required": True, "schema": schema}
+        for name, schema in schemas
+    )
+
+
+def add_path_parameters(parameters: list[dict], generated: Iterable[dict]) -> None:
+    """Add generated path parameters to the parameters of a path, unless they
+    are already declared.
+
+    :param list parameters: Parameters of the path, modified in place.
+    :param generated: Path parameters generated from the route.
+    """
+    declared = {param["name"] for param in parameters if param.get("in") == "path"}
+    parameters.extend(
+        deepcopy(param) for param in generated if param["name"] not in declared
+    )
+
+
+PathPattern = str | re.Pattern[str]
+
+
+class _Patterns:
+    """Globs and regular expressions, compiled once.
+
+    Regular expressions are kept as is, so their flags and group names apply
+    to them only.
+    """
+
+    __slots__ = ("_patterns",)
+
+    def __init__(self, patterns: Iterable[PathPattern]) -> None:
+        self._patterns = tuple(
+            pattern
+            if isinstance(pattern, re.Pattern)
+            else re.compile(fnmatch.translate(pattern))
+            for pattern in patterns
+        )
+
+    def match(self, string: str) -> bool:
+        return any(pattern.match(string) for pattern in self._patterns)
+
+
+def _compile(patterns: Iterable[PathPattern]) -> _Patterns | None:
+    compiled = _Patterns(patterns)
+    return compiled if compiled._patterns else None
+
+
+class RouteFilter:
+    """Selects the routes and methods to document.
+
+    Patterns are compiled once, so a filter can be applied to every route of
+    an app at little cost. Path and endpoint patterns are globs, or compiled
+    regular expressions matched at the beginning of the string. A route is
+    kept if it matches every criterion given; methods are narrowed down to the
+    ones selected, and routes left without methods are dropped.
+    ::
+
+        public = RouteFilter(
+            exclude_paths=["/internal/*", re.compile(r"/v[0-9]+/admin/")],
+            exclude_methods=["head", "options"],
+        )
+        for record in plugin.route_records(app, route_filter=public):
+            spec.path(record=record)
+
+    :param paths: Paths (OpenAPI templates) to include.
+    :param exclude_paths: Paths to exclude.
+    :param methods: HTTP methods to include.
+    :param exclude_methods: HTTP methods to exclude.
+    :param endpoints: Endpoint names to include.
+    :param exclude_endpoints: Endpoint names to exclude.
+    :param blueprints: Flask blueprint names to include.
+    :param exclude_blueprints: Flask blueprint names to exclude.
+    :param predicate: Callable receiving the `RouteRecord`, returns whether
+        to include it.
+    """
+
+    __slots__ = (
+        "_paths",
+        "_exclude_paths",
+        "_methods",
+        "_exclude_methods",
+        "_endpoints",
+        "_exclude_endpoints",
+        "_blueprints",
+        "_exclude_blueprints",
+        "_predicate",
+    )
+
+    def __init__(
+        self,
+        *,
+        paths: Iterable[PathPattern] = (),
+        exclude_paths: Iterable[PathPattern] = (),
+        methods: Iterable[str] | None = None,
+        exclude_methods: Iterable[str] = (),
+        endpoints: Iterable[PathPattern] = (),
+        exclude_endpoints: Iterable[PathPattern] = (),
+        blueprints: Iterable[str] | None = None,
+        exclude_blueprints: Iterable[str] = (),
+        predicate: Callable[[RouteRecord], bool] | None = None,
+    ) -> None:
+        self._paths = _compile(paths)
+        self._exclude_paths = _compile(exclude_paths)
+        self._methods = (
+            None if methods is None else frozenset(m.lower() for m in methods)
+        )
+        self._exclude_methods = frozenset(m.lower() for m in exclude_methods)
+        self._endpoints = _compile(endpoints)
+        self._exclude_endpoints = _compile(exclude_endpoints)
+        self._blueprints = None if blueprints is None else frozenset(blueprints)
+        self._exclude_blueprints = frozenset(exclude_blueprints)
+        self._predicate = predicate
+
+    def __call__(self, record: RouteRecord) -> RouteRecord | None:
+        """Return the record with its selected methods, or `None` if the route
+        is filtered out.
+        """
+        path = record.path
+        if self._paths is not None and not self._paths.match(path):
+            return None
+        if self._exclude_paths is not None and self._exclude_paths.match(path):
+            return None
+        endpoint = record.endpoint or ""
+        if self._endpoints is not None and not self._endpoints.match(endpoint):
+            return None
+        if self._exclude_endpoints is not None and self._exclude_endpoints.match(
+            endpoint
+        ):
+            return None
+        if self._blueprints is not None or self._exclude_blueprints:
+            blueprint = endpoint.rpartition(".")[0]
+            if self._blueprints is not None and blueprint not in self._blueprints:
+                return None
+            if blueprint in self._exclude_blueprints:
+                return None
+        methods = record.methods
+        if self._methods is not None or self._exclude_methods:
+            methods = tuple(
+                method
+                for method in methods
+                if (self._methods is None or method in self._methods)
+                and method not in self._exclude_methods
+            )
+            if not methods:
+                return None
+        if self._predicate is not None and not self._predicate(record):
+            return None
+        if methods != record.methods:
+            record = record._replace(methods=methods)
+        return record
+
+    def apply(self, records: Iterable[RouteRecord]) -> Iterator[RouteRecord]:
+        """Filter records, see `__call__`."""
+        for record in records:
+            selected = self(record)
+            if selected is not None:
+                yield selected
+
+
+class RouteScan:
+    """Routes scanned once, to build several specs from them.
+
+    Docstrings are parsed the first time they are needed and reused for every
+    other spec, so building variants (OpenAPI versions, public and internal
+    specs...) costs little more than building one.
+    ::
+
+        scan = RouteScan(FlaskPlugin().route_records(app))
+        for openapi_version in ("2.0", "3.0.2"):
+            spec = APISpec(
+                title="Gisty",
+                version="1.0.0",
+                openapi_version=openapi_version,
+                plugins=[FlaskPlugin()],
+            )
+            scan.register(spec, route_filter=RouteFilter(paths=["/v1/*"]))
+
+    :param records: Records produced by a plugin's ``route_records``.
+    """
+
+    def __init__(self, records: Iterable[RouteRecord]) -> None:
+        self.records = tuple(records)
+        self._docstrings = docs.DocstringCache()
+
+    def register(
+        self,
+        spec: APISpec,
+        route_filter: RouteFilter | None = None,
+        **kwargs: Any,
+    ) -> APISpec:
+        """Add a path to a spec for each scanned route.
+
+        The spec must be set up with the plugin that produced the records.
+
+        :param APISpec spec: Spec to add paths to.
+        :param RouteFilter route_filter: Routes and methods to include.
+        :param kwargs: Passed to `APISpec.path` for every route.
+        """
+        records: Iterable[RouteRecord] = self.records
+        if route_filter is not None:
+            records = route_filter.apply(records)
+        with docs.cached_parsing(self._docstrings):
+            for record in records:
+                spec.path(record=record, **kwargs)
+        return spec
+
+
+class RouteRegistry:
+    """Records of the routes of an app, in the order they are declared.
+
+    Plugins fill a registry as routes are added to the app (see
+    ``FlaskPlugin.capture``), so specs are built without scanning the app,
+    and routes added later are documented by registering the spec again::
+
+        registry = FlaskPlugin().capture(app)
+        # ... declare routes, register blueprints ...
+        registry.register(spec)
+        # ... declare more routes ...
+        registry.register(spec)  # Adds the new routes only
+    """
+
+    def __init__(self) -> None:
+        self._records: list[RouteRecord] = []
+        self._resolvers: list[Callable[[], Iterable[RouteRecord]]] = []
+        self._registered: weakref.WeakKeyDictionary[APISpec, int] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def records(self) -> tuple[RouteRecord, ...]:
+        """Records captured so far."""
+        self._resolve()
+        return tuple(self._records)
+
+    def add(self, record: RouteRecord) -> None:
+        """Record a route.
+
+        :param RouteRecord record: Record of the route.
+        """
+        with self._lock:
+            self._records.append(record)
+
+    def add_resolver(self, resolver: Callable[[], Iterable[RouteRecord]]) -> None:
+        """Register a callable returning the records of routes that could not
+        be recorded when declared, e.g. routes whose view function was not
+        known yet, as they become complete. Resolvers are called before
+        records are read.
+
+        :param resolver: Callable returning the newly completed records.
+        """
+        self._resolvers.append(resolver)
+
+    def _resolve(self) -> None:
+        for resolver in self._resolvers:
+            for record in resolver():
+                self.add(record)
+
+    def register(
+        self,
+        spec: APISpec,
+        route_filter: RouteFilter | None = None,
+        **kwargs: Any,
+    ) -> APISpec:
+        """Add a path to a spec for each route recorded since the spec was
+        last registered.
+
+        The spec must be set up with the plugin that captured the routes.
+
+        :param APISpec spec: Spec to add paths to.
+        :param RouteFilter route_filter: Routes and methods to include.
+        :param kwargs: Passed to `APISpec.path` for every route.
+        """
+        self._resolve()
+        with self._lock:
+            start = self._registered.get(spec, 0)
+            records = self._records[start:]
+        # Routes may be recorded meanwhile, they are left for the next call
+        position = start
+        try:
+            for record in records:
+                selected = record if route_filter is None else route_filter(record)
+                if selected is not None:
+                    spec.path(record=selected, **kwargs)
+                position += 1
+        finally:
+            with self._lock:
+                self._registered[spec] = position
+        return spec
@@ -0,0 +1,102 @@
+"""Fast serialization of specs to JSON and YAML bytes.
+
+JSON is encoded with `orjson <https://github.com/ijl/orjson>`_ if it is
+installed, and with the standard library otherwise. YAML is dumped with
+PyYAML's LibYAML-based ``CDumper`` when PyYAML is built with it.
+::
+
+    from apispec_webframeworks.serialization import serialize
+
+    serialize(spec)  # Minified JSON
+    serialize(spec, "yaml")
+    serialize(spec, canonical=True)  # Sorted keys, e.g. to hash the spec
+
+Canonical output is stable for a given JSON encoder: the two encoders may
+format some numbers differently.
+"""
+
+import json
+from typing import Any
+
+import yaml
+from apispec import APISpec
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type:ignore[assignment]
+
+try:
+    from yaml import CDumper as YAMLDumper
+except ImportError:  # pragma: no cover, PyYAML built without LibYAML
+    from yaml import Dumper as YAMLDumper  # type:ignore[assignment]
+
+#: Name of the JSON encoder in use.
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+FORMATS = ("json", "yaml")
+
+
+def _str_keys(obj: Any) -> Any:
+    """Convert mapping keys to strings, as JSON does, so that keys of mixed
+    types (e.g. ``200`` and ``"default"`` responses) can be sorted.
+    """
+    if isinstance(obj, dict):
+        return {str(key): _str_keys(val) for key, val in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_str_keys(item) for item in obj]
+    return obj
+
+
+def to_json(data: dict, *, canonical: bool = False) -> bytes:
+    """Serialize a spec dict to minified, UTF-8 encoded JSON.
+
+    :param dict data: Spec, as returned by `APISpec.to_dict`.
+    :param bool canonical: Sort keys, so equal specs give equal bytes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if canonical:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson rejects some values json accepts, e.g. integers
+            # outside 64 bits
+            pass
+    if canonical:
+        data = _str_keys(data)
+    return json.dumps(
+        data, separators=(",", ":"), ensure_ascii=False, sort_keys=canonical
+    ).encode("utf-8")
+
+
+def to_yaml(data: dict, *, canonical: bool = False) -> bytes:
+    """Serialize a spec dict to UTF-8 encoded YAML.
+
+    Without ``canonical``, the YAML is equivalent to that of `APISpec.to_yaml`,
+    with keys in the same order, but LibYAML may wrap long strings differently.
+
+    :param dict data: Spec, as returned by `APISpec.to_dict`.
+    :param bool canonical: Sort keys, so equal specs give equal bytes.
+    """
+    if canonical:
+        data = _str_keys(data)
+    return yaml.dump(data, Dumper=YAMLDumper, sort_keys=canonical).encode("utf-8")
+
+
+def serialize(
+    spec: APISpec | dict, fmt: str = "json", *, canonical: bool = False
+) -> bytes:
+    """Serialize a spec to bytes.
+
+    :param spec: Spec, or spec dict as returned by `APISpec.to_dict`.
+    :param str fmt: ``"json"`` or ``"yaml"``.
+    :param bool canonical: Sort keys, so equal specs give equal bytes.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported spec format: {fmt!r}")
+    data = spec.to_dict() if isinstance(spec, APISpec) else spec
+    if fmt == "json":
+        return to_json(data, canonical=canonical)
+    return to_yaml(data, canonical=canonical)
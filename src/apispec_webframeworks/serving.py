@@ -0,0 +1,188 @@
+"""Helpers for serving a generated spec.
+
+Sharing one serialized spec between prefork workers
+(e.g. gunicorn ``--preload``)::
+
+    from apispec_webframeworks.serving import MappedSpec, write_spec
+
+    # In the master process, once the app is set up
+    write_spec(spec, "/run/myapp/openapi.json")
+
+    # In each worker
+    mapped = MappedSpec("/run/myapp/openapi.json")
+
+The file is memory-mapped read-only, so every worker reads the same pages of
+the OS page cache and memory holds one copy of the spec per host rather than
+one per worker.
+
+`CachedSpec` serializes a spec once, on first use, and keeps the bytes along
+with compressed copies, for spec endpoints under polling load.
+"""
+
+import gzip
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from apispec import APISpec
+
+from .serialization import serialize
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+CHUNK_SIZE = 64 * 1024
+
+MIMETYPES = {"json": "application/json", "yaml": "application/yaml"}
+
+#: Content codings of `SerializedSpec`, in order of preference.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _etag(data: bytes | memoryview) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def write_spec(
+    spec: APISpec,
+    path: str | os.PathLike,
+    *,
+    fmt: str = "json",
+    canonical: bool = False,
+) -> None:
+    """Serialize a spec to a file, atomically replacing any previous version.
+
+    :param APISpec spec: Spec to serialize.
+    :param path: Destination file.
+    :param str fmt: ``"json"`` or ``"yaml"``.
+    :param bool canonical: Sort keys, so equal specs give equal files.
+    """
+    data = serialize(spec, fmt, canonical=canonical)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".openapi-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class MappedSpec:
+    """Read-only memory map of a spec written by `write_spec`.
+
+    :param path: File written by `write_spec`.
+    :param str fmt: ``"json"`` or ``"yaml"``, the format the file was written
+        in. Defaults to ``"yaml"`` for ``.yaml`` and ``.yml`` files, and to
+        ``"json"`` otherwise.
+    """
+
+    def __init__(self, path: str | os.PathLike, fmt: str | None = None) -> None:
+        self.path = os.fspath(path)
+        if fmt is None:
+            suffix = os.path.splitext(self.path)[1].lower()
+            fmt = "yaml" if suffix in (".yaml", ".yml") else "json"
+        if fmt not in MIMETYPES:
+            raise ValueError(f"Unsupported spec format: {fmt!r}")
+        self.fmt = fmt
+        self.mimetype = MIMETYPES[fmt]
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+        self._etag: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __enter__(self) -> "MappedSpec":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def etag(self) -> str:
+        """Hash of the mapped content, computed once."""
+        if self._etag is None:
+            self._etag = _etag(self.buffer)
+        return self._etag
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Iterate over the content in chunks, e.g. as a WSGI response body.
+
+        Each chunk is a transient copy: nothing but the map itself is retained.
+        """
+        buffer = self.buffer
+        for start in range(0, len(buffer), chunk_size):
+            yield bytes(buffer[start : start + chunk_size])
+
+    def close(self) -> None:
+        self.buffer.release()
+        self._mmap.close()
+
+
+class SerializedSpec:
+    """A serialized spec, with its ETag and compressed copies.
+
+    :param bytes content: Serialized spec.
+    :param str mimetype: Media type of ``content``.
+    """
+
+    __slots__ = ("content", "mimetype", "etag", "_encoded")
+
+    def __init__(self, content: bytes, mimetype: str) -> None:
+        self.content = content
+        self.mimetype = mimetype
+        self.etag = _etag(content)
+        self._encoded = {"gzip": gzip.compress(content, mtime=0)}
+        if brotli is not None:
+            self._encoded["br"] = brotli.compress(content)
+
+    def encoded(self, encoding: str | None) -> bytes:
+        """Return the content compressed with a coding of `ENCODINGS`, or as
+        is if ``encoding`` is `None`.
+        """
+        return self.content if encoding is None else self._encoded[encoding]
+
+    def etag_for(self, encoding: str | None) -> str:
+        """ETag of the content in a given coding."""
+        return self.etag if encoding is None else f"{self.etag}-{encoding}"
+
+
+class CachedSpec:
+    """Builds and serializes a spec once, on first use.
+
+    Building happens under a lock, so concurrent first requests build the
+    spec only once; afterwards, reads take no lock.
+
+    :param spec: Spec, or callable returning the spec, e.g. an app factory
+        helper. A callable is only called on first use.
+    """
+
+    def __init__(self, spec: APISpec | Callable[[], APISpec]) -> None:
+        self._spec = spec
+        self._serialized: dict[str, SerializedSpec] = {}
+        self._lock = threading.Lock()
+
+    def get(self, fmt: str = "json") -> SerializedSpec:
+        """Return the spec serialized as ``"json"`` or ``"yaml"``."""
+        try:
+            return self._serialized[fmt]
+        except KeyError:
+            pass
+        with self._lock:
+            if fmt not in self._serialized:
+                if not isinstance(self._spec, APISpec):
+                    self._spec = self._spec()
+                self._serialized[fmt] = SerializedSpec(
+                    serialize(self._spec, fmt), MIMETYPES[fmt]
+                )
+            return self._serialized[fmt]
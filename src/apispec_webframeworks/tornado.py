@@ -32,13 +32,127 @@ object to `path`.
 """  # noqa: E501
 
 import inspect
-from collections.abc import Callable, Iterator
-from typing import Any, cast
+import re
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, NamedTuple, cast
 
 from apispec import BasePlugin, yaml_utils
 from apispec.exceptions import APISpecError
 from tornado.routing import PathMatches
-from tornado.web import RequestHandler, URLSpec
+from tornado.web import Application, RequestHandler, URLSpec
+
+from . import docs
+from ._cache import ReadMostlyCache
+from .routes import RouteFilter, RouteRecord
+
+try:
+    from re import _parser as sre_parse  # type:ignore[attr-defined]
+except ImportError:  # pragma: no cover, Python < 3.11
+    import sre_parse
+
+
+class PathTemplate(NamedTuple):
+    """OpenAPI path template compiled from a URLSpec regex."""
+
+    #: Path with a ``%s`` placeholder for each path argument.
+    template: str
+    #: Group of each placeholder: its name, or its number for unnamed groups.
+    groups: tuple[str | int, ...]
+
+    def format(self, args: Iterable[str]) -> str:
+        """Return the path, naming path arguments ``args``."""
+        return self.template % tuple(f"{{{arg}}}" for arg in args)
+
+
+class _UnsupportedPattern(Exception):
+    """Part of a pattern that matches several paths, outside of a capturing
+    group.
+    """
+
+
+def _is_trailing_slash(av: Any, following: Any) -> bool:
+    """Whether a repeat is an optional slash at the end of the pattern."""
+    min_count, _, sub_items = av
+    return (
+        min_count == 0
+        and all(op is sre_parse.LITERAL and av == ord("/") for op, av in sub_items)
+        and all(op is sre_parse.AT for op, _ in following)
+    )
+
+
+def _render(
+    items: Any, template: list[str], groups: list[int], top_level: bool = True
+) -> None:
+    """Render parsed regex items as a path, replacing capturing groups with
+    placeholders.
+
+    Raises `_UnsupportedPattern` for anything else that matches several paths
+    (alternations, character classes, optional or repeated parts), rather
+    than documenting one of them.
+    """
+    items = list(items)
+    for index, (op, av) in enumerate(items):
+        if op is sre_parse.LITERAL:
+            template.append(chr(av).replace("%", "%%"))
+        elif op is sre_parse.ANY:
+            # Unescaped dots, as in "/pets.json", are meant literally
+            template.append(".")
+        elif op is sre_parse.SUBPATTERN:
+            group, _, _, sub_items = av
+            if group is None:
+                _render(sub_items, template, groups, top_level=False)
+            else:
+                # Nested groups are part of the argument
+                template.append("%s")
+                groups.append(group)
+        elif op.name == "ATOMIC_GROUP":
+            _render(av, template, groups, top_level=False)
+        elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # Zero-width
+            continue
+        elif (
+            op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+            or op.name == "POSSESSIVE_REPEAT"
+        ):
+            if not (top_level and _is_trailing_slash(av, items[index + 1 :])):
+                raise _UnsupportedPattern("an optional or repeated part")
+        elif op is sre_parse.BRANCH:
+            raise _UnsupportedPattern("an alternation")
+        elif op is sre_parse.IN:
+            raise _UnsupportedPattern("a character class or alternation")
+        else:
+            raise _UnsupportedPattern(op.name.lower())
+
+
+def _compile_path(regex_pattern: str) -> PathTemplate | str:
+    try:
+        parsed = sre_parse.parse(regex_pattern)
+        template: list[str] = []
+        groups: list[int] = []
+        _render(parsed, template, groups)
+    except _UnsupportedPattern as exc:
+        return (
+            f"Could not convert pattern {regex_pattern!r} to a path template: "
+            f"it has {exc} outside of a capturing group"
+        )
+    names = {
+        number: name for name, number in re.compile(regex_pattern).groupindex.items()
+    }
+    path = "".join(template)
+    if path.count("/") > 1:
+        path = path.rstrip("/")
+    return PathTemplate(path, tuple(names.get(group, group) for group in groups))
+
+
+#: Path template of each pattern, or the reason it cannot be converted
+_path_templates: ReadMostlyCache[str, PathTemplate | str] = ReadMostlyCache(
+    _compile_path
+)
+
+#: Arguments of each handler method, held weakly to not keep handlers alive
+_method_arguments: ReadMostlyCache[Callable, tuple[str, ...]] = ReadMostlyCache(
+    lambda method: tuple(inspect.signature(method).parameters)[1:], weak=True
+)
 
 
 class TornadoPlugin(BasePlugin):
@@ -55,14 +169,59 @@ class TornadoPlugin(BasePlugin):
         """
         for httpmethod in sorted(yaml_utils.PATH_KEYS):
             method = getattr(handler_class, httpmethod)
-            docstring = method.__doc__ or ""
-            operation_data = yaml_utils.load_yaml_from_docstring(docstring)
+            operation_data = docs.load_yaml(method)
             if operation_data:
                 operation = {httpmethod: operation_data}
                 yield operation
 
     @staticmethod
-    def tornadopath2openapi(urlspec: URLSpec, method: Callable) -> str:
+    def path_template(urlspec: URLSpec) -> PathTemplate:
+        """Compile the regex of a Tornado URLSpec to an OpenAPI path template.
+
+        Unlike Tornado's own reversing, this supports nested and non-capturing
+        groups. Patterns matching several paths outside of capturing groups,
+        e.g. with alternations or character classes, raise `APISpecError`
+        rather than documenting only one of the paths: capture these parts
+        in a group to document them as path parameters. Templates are computed
+        once per pattern.
+
+        :param urlspec:
+        :type urlspec: URLSpec
+        """
+        matcher = cast(PathMatches, urlspec.matcher)
+        compiled = _path_templates[matcher.regex.pattern]
+        if isinstance(compiled, str):
+            raise APISpecError(compiled)
+        return compiled
+
+    @classmethod
+    def _path_arguments(cls, urlspec: URLSpec, method: Callable) -> list[str]:
+        """Names of the path arguments of a Tornado URLSpec, in order.
+
+        Named groups keep their names, other groups are named after the
+        arguments of the handler method.
+
+        :param urlspec:
+        :type urlspec: URLSpec
+        :param method: Handler http method
+        :type method: function
+        """
+        groups = cls.path_template(urlspec).groups
+        if all(isinstance(group, str) for group in groups):
+            return cast(list[str], list(groups))
+        # Tornado passes the groups to the method in order, nested ones included
+        method_args = _method_arguments[method]
+        return [
+            group
+            if isinstance(group, str)
+            else method_args[group - 1]
+            if group <= len(method_args)
+            else f"arg{group}"
+            for group in groups
+        ]
+
+    @classmethod
+    def tornadopath2openapi(cls, urlspec: URLSpec, method: Callable) -> str:
         """Convert Tornado URLSpec to OpenAPI-compliant path.
 
         :param urlspec:
@@ -70,37 +229,72 @@ class TornadoPlugin(BasePlugin):
         :param method: Handler http method
         :type method: function
         """
+        return cls.path_template(urlspec).format(cls._path_arguments(urlspec, method))
+
+    @staticmethod
+    def _implemented_methods(handler_class: type[RequestHandler]) -> list[str]:
+        """HTTP methods overridden by a handler class, in sorted order."""
+        return [
+            httpmethod
+            for httpmethod in sorted(yaml_utils.PATH_KEYS)
+            if getattr(handler_class, httpmethod)
+            is not getattr(RequestHandler, httpmethod)
+        ]
+
+    @classmethod
+    def _record_for_urlspec(
+        cls, urlspec: URLSpec, method: Callable | None = None
+    ) -> RouteRecord:
+        handler_class = urlspec.handler_class
+        methods = cls._implemented_methods(handler_class)
+        if method is None:
+            method = getattr(handler_class, methods[0] if methods else "get")
         matcher = cast(PathMatches, urlspec.matcher)
-        regex = matcher.regex
-        path_tpl = cast(str, matcher._path)
-        if regex.groups:
-            if regex.groupindex:
-                # urlspec path uses named groups
-                sorted_pairs = sorted(
-                    ((k, v) for k, v in regex.groupindex.items()),
-                    key=lambda kv: kv[1],
-                )
-                args = [pair[0] for pair in sorted_pairs]
-            else:
-                args = list(inspect.signature(method).parameters.keys())[1:]
+        return RouteRecord.create(
+            rule=matcher.regex.pattern,
+            path=cls.tornadopath2openapi(urlspec, method),
+            methods=methods,
+            handler=handler_class,
+            parameters=cls._path_arguments(urlspec, method),
+            endpoint=urlspec.name,
+        )
 
-            params = tuple(f"{{{arg}}}" for arg in args)
-            path = path_tpl % params
-        else:
-            path = path_tpl
-        if path.count("/") > 1:
-            path = path.rstrip("/?*")
-        return path
+    def route_records(
+        self,
+        urlspecs: Application | Iterable[URLSpec | tuple],
+        route_filter: RouteFilter | None = None,
+    ) -> Iterator[RouteRecord]:
+        """Generate a `RouteRecord` for each URLSpec of a Tornado app.
+
+        :param urlspecs: Tornado app, or URLSpecs or tuples as passed to it.
+        :param RouteFilter route_filter: Routes and methods to include.
+        """
+        if isinstance(urlspecs, Application):
+            urlspecs = [
+                URLSpec(rule.matcher.regex, rule.target, rule.target_kwargs, rule.name)
+                for rule in urlspecs.wildcard_router.rules
+                if isinstance(rule.matcher, PathMatches)
+                and isinstance(rule.target, type)
+                and issubclass(rule.target, RequestHandler)
+            ]
+        records: Iterator[RouteRecord] = (
+            self._record_for_urlspec(
+                urlspec if isinstance(urlspec, URLSpec) else URLSpec(*urlspec)
+            )
+            for urlspec in urlspecs
+        )
+        if route_filter is not None:
+            records = route_filter.apply(records)
+        yield from records
 
     @staticmethod
     def _extensions_from_handler(handler_class: RequestHandler) -> dict:
-        """Returns extensions dict from handler docstring
+        """Returns extensions dict from handler docstring or `doc` data
 
         :param handler_class:
         :type handler_class: RequestHandler descendant
         """
-        docstring = handler_class.__doc__ or ""
-        return yaml_utils.load_yaml_from_docstring(docstring)
+        return docs.load_yaml(handler_class)
 
     def path_helper(
         self,
@@ -109,21 +303,36 @@ class TornadoPlugin(BasePlugin):
         parameters: list[dict] | None = None,
         *,
         urlspec: URLSpec | tuple | None = None,
+        record: RouteRecord | None = None,
         **kwargs: Any,
     ) -> str | None:
-        """Path helper that allows passing a Tornado URLSpec or tuple."""
+        """Path helper that allows passing a Tornado URLSpec or tuple, or a
+        `RouteRecord` generated by `route_records`.
+
+        When passing a record, only the operations for the methods of the
+        record are documented.
+        """
         assert operations is not None
-        assert urlspec is not None
 
-        if not isinstance(urlspec, URLSpec):
-            urlspec = URLSpec(*urlspec)
-        for operation in self._operations_from_methods(urlspec.handler_class):
-            operations.update(operation)
+        if record is None:
+            assert urlspec is not None
+            if not isinstance(urlspec, URLSpec):
+                urlspec = URLSpec(*urlspec)
+            handler_class = urlspec.handler_class
+        else:
+            handler_class = record.handler
+        for operation in self._operations_from_methods(handler_class):
+            if record is None or record.select_operations(operation):
+                operations.update(operation)
         if not operations:
-            raise APISpecError(f"Could not find endpoint for urlspec {urlspec}")  # noqa: E501
-        params_method = getattr(
-            urlspec.handler_class,
-            list(operations.keys())[0],
-        )
-        operations.update(self._extensions_from_handler(urlspec.handler_class))
-        return self.tornadopath2openapi(urlspec, params_method)
+            raise APISpecError(
+                f"Could not find endpoint for urlspec {urlspec or record}"
+            )
+        if isinstance(urlspec, URLSpec):
+            params_method = getattr(handler_class, list(operations.keys())[0])
+            path = self.tornadopath2openapi(urlspec, params_method)
+        else:
+            assert record is not None
+            path = record.path
+        operations.update(self._extensions_from_handler(handler_class))
+        return path
@@ -0,0 +1,18 @@
+import pytest
+from apispec import yaml_utils
+
+pytest_plugins = ["pytester"]
+
+
+@pytest.fixture
+def parsed_docstrings(monkeypatch):
+    """Docstrings parsed as YAML during the test."""
+    calls = []
+    load_yaml_from_docstring = yaml_utils.load_yaml_from_docstring
+
+    def counting_load(docstring):
+        calls.append(docstring)
+        return load_yaml_from_docstring(docstring)
+
+    monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", counting_load)
+    return calls
@@ -0,0 +1,56 @@
+import gc
+import threading
+
+from apispec_webframeworks._cache import ReadMostlyCache
+
+from .utils import run_concurrently
+
+
+class TestReadMostlyCache:
+    def test_computes_missing_values_once(self):
+        calls = []
+
+        def factory(key):
+            calls.append(key)
+            return key * 2
+
+        cache = ReadMostlyCache(factory)
+        assert cache["a"] == "aa"
+        assert cache["a"] == "aa"
+        assert calls == ["a"]
+        assert "a" in cache
+        assert len(cache) == 1
+
+    def test_clear(self):
+        cache = ReadMostlyCache(str.upper)
+        cache["a"]
+        cache.clear()
+        assert "a" not in cache
+        assert len(cache) == 0
+
+    def test_concurrent_misses_publish_a_single_value(self):
+        lock = threading.Lock()
+        created = []
+
+        def factory(key):
+            value = object()
+            with lock:
+                created.append(value)
+            return value
+
+        cache = ReadMostlyCache(factory)
+        results = run_concurrently(lambda i: cache["key"])
+        assert all(result is results[0] for result in results)
+        assert results[0] in created
+
+    def test_weak_keys(self):
+        class Key:
+            pass
+
+        key = Key()
+        cache = ReadMostlyCache(lambda key: type(key).__name__, weak=True)
+        assert cache[key] == "Key"
+        assert key in cache
+        del key
+        gc.collect()
+        assert len(cache) == 0
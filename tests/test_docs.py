@@ -0,0 +1,94 @@
+import pytest
+from apispec import yaml_utils
+
+from apispec_webframeworks.docs import (
+    DocstringCache,
+    cached_parsing,
+    doc,
+    load_operations,
+    load_yaml,
+)
+
+
+@pytest.fixture
+def no_yaml(monkeypatch):
+    def fail(docstring):
+        raise AssertionError("YAML should not be parsed")
+
+    monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", fail)
+
+
+class TestDoc:
+    def test_declared_data_is_used(self, no_yaml):
+        @doc({"get": {"description": "get"}}, post={"description": "post"})
+        def view():
+            """Not parsed.
+            ---
+            get:
+                description: from docstring
+            """
+
+        assert load_yaml(view) == {
+            "get": {"description": "get"},
+            "post": {"description": "post"},
+        }
+
+    def test_load_returns_copies(self):
+        @doc(get={"responses": {200: {}}})
+        def view():
+            pass
+
+        load_yaml(view)["get"]["responses"]["200"] = {}
+        assert load_yaml(view) == {"get": {"responses": {200: {}}}}
+
+    def test_load_operations_filters_keys(self):
+        @doc(get={}, foo={}, **{"x-extension": "value"})
+        def view():
+            pass
+
+        assert load_operations(view) == {"get": {}, "x-extension": "value"}
+
+    def test_falls_back_to_docstring(self):
+        def view():
+            """A view.
+            ---
+            get:
+                description: from docstring
+            """
+
+        assert load_yaml(view) == {"get": {"description": "from docstring"}}
+
+    def test_class_data_is_not_inherited(self):
+        @doc(**{"x-extension": "value"})
+        class Base:
+            pass
+
+        class Child(Base):
+            pass
+
+        assert load_yaml(Base) == {"x-extension": "value"}
+        assert load_yaml(Child) == {}
+
+
+class TestCachedParsing:
+    def test_docstrings_parsed_once(self, parsed_docstrings):
+        def view():
+            """A view.
+            ---
+            get:
+                responses:
+                    200:
+                        description: ok
+            """
+
+        cache = DocstringCache()
+        with cached_parsing(cache):
+            first = load_yaml(view)
+        with cached_parsing(cache):
+            second = load_yaml(view)
+        assert len(parsed_docstrings) == 1
+        assert first == second
+        assert first is not second
+        first["get"]["responses"].clear()
+        assert load_yaml(view) == second
+        assert len(parsed_docstrings) == 2
@@ -1,10 +1,12 @@
 import pytest
 from aiohttp import web
-from apispec import APISpec
+from apispec import APISpec, yaml_utils
 
 from apispec_webframeworks.aiohttp import AiohttpPlugin
+from apispec_webframeworks.docs import doc
+from apispec_webframeworks.routes import RouteFilter
 
-from .utils import get_paths
+from .utils import get_paths, run_concurrently
 
 
 @pytest.fixture(params=("2.0", "3.0.0"))
@@ -99,3 +101,94 @@ class TestPathHelpers:
             "responses": {"200": {"description": "A greeting to the client"}},
         }
         assert paths["/hello"]["get"] == expected
+
+    def test_path_from_decorated_handler(self, spec, monkeypatch):
+        monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", None)
+
+        @doc(description="get a greeting")
+        async def hello(request):
+            return web.Response(text="hello")
+
+        app = web.Application()
+        app.add_routes([web.get("/hello", hello, allow_head=False)])
+        self.add_routes_to_spec(app.router.routes(), spec)
+        assert get_paths(spec)["/hello"] == {"get": {"description": "get a greeting"}}
+
+
+class TestRouteRecords:
+    def test_route_records(self):
+        async def pet_toy(request):
+            """Toy of a pet."""
+
+        app = web.Application()
+        app.add_routes([web.put(r"/pets/{pet_id:\d+}/toys/{toy}", pet_toy, name="toy")])
+        (record,) = AiohttpPlugin().route_records(app)
+        assert record.path == "/pets/{pet_id}/toys/{toy}"
+        assert record.methods == ("put",)
+        assert record.handler is pet_toy
+        assert record.parameters == ("pet_id", "toy")
+        assert record.endpoint == "toy"
+
+    def test_path_from_record(self, spec):
+        async def hello(request):
+            """Get a greeting endpoint.
+            ---
+            description: get a greeting
+            """
+
+        app = web.Application()
+        app.add_routes([web.get("/hello", hello)])
+        records = AiohttpPlugin().route_records(app.router.routes())
+        for record in records:
+            spec.path(record=record)
+        assert get_paths(spec)["/hello"] == {
+            "get": {"description": "get a greeting"},
+            "head": {"description": "get a greeting"},
+        }
+
+    def test_filtered_route_records(self, spec):
+        async def hello(request):
+            return web.Response(text="hello")
+
+        app = web.Application()
+        app.add_routes([web.get("/hello", hello), web.get("/internal", hello)])
+        route_filter = RouteFilter(
+            exclude_paths=["/internal"], exclude_methods=["head"]
+        )
+        for record in AiohttpPlugin().route_records(app, route_filter=route_filter):
+            spec.path(record=record)
+        assert get_paths(spec) == {"/hello": {"get": {}}}
+
+
+class TestConcurrency:
+    def test_shared_plugin_concurrent_path_helpers(self):
+        async def pet(request):
+            """A pet.
+            ---
+            responses:
+                200:
+                    description: a pet
+            """
+
+        app = web.Application()
+        app.add_routes([web.get(f"/pets{i}/{{pet_id}}", pet) for i in range(10)])
+        plugin = AiohttpPlugin()
+        routes = [route for route in app.router.routes() if route.method != "HEAD"]
+
+        def build(index):
+            spec = APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.0",
+                plugins=(plugin,),
+            )
+            for route in routes:
+                spec.path(route=route)
+            return get_paths(spec)
+
+        results = run_concurrently(build)
+        assert len(results[0]) == 10
+        assert results[0]["/pets3/{pet_id}"]["get"] == {
+            "responses": {"200": {"description": "a pet"}}
+        }
+        assert all(result == results[0] for result in results)
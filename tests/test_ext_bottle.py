@@ -1,10 +1,13 @@
 import pytest
-from apispec import APISpec
-from bottle import route
+from apispec import APISpec, yaml_utils
+from apispec.exceptions import APISpecError
+from bottle import Bottle, route
 
 from apispec_webframeworks.bottle import BottlePlugin
+from apispec_webframeworks.docs import doc
+from apispec_webframeworks.routes import RouteFilter
 
-from .utils import get_paths
+from .utils import get_paths, run_concurrently
 
 
 @pytest.fixture(params=("2.0", "3.0.0"))
@@ -109,3 +112,273 @@ class TestPathHelpers:
 
         spec.path(view=handler)
         assert "/pet/{pet_id}/{shop_id}" in get_paths(spec)
+
+    def test_path_from_decorated_view(self, spec, monkeypatch):
+        monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", None)
+
+        @route("/hello")
+        @doc(get={"description": "get a greeting"}, **{"x-extension": "value"})
+        def hello():
+            return "hi"
+
+        spec.path(view=hello)
+        assert get_paths(spec)["/hello"] == {
+            "get": {"description": "get a greeting"},
+            "x-extension": "value",
+        }
+
+
+class TestPathParameters:
+    @pytest.fixture(params=("2.0", "3.0.0"))
+    def spec(self, request):
+        return APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version=request.param,
+            plugins=(BottlePlugin(path_parameters=True),),
+        )
+
+    @staticmethod
+    def expected(spec, name, **schema):
+        if spec.openapi_version.major < 3:
+            return {"in": "path", "name": name, "required": True, **schema}
+        return {"in": "path", "name": name, "required": True, "schema": schema}
+
+    def test_parameters_from_filters(self, spec):
+        app = Bottle()
+
+        @app.route(
+            "/pets/<pet_id:int>/<weight:float>/<code:re:[a-z]+>/<name>/<rest:path>"
+        )
+        def pet(**kwargs):
+            pass
+
+        spec.path(view=pet, app=app)
+        path = "/pets/{pet_id}/{weight}/{code}/{name}/{rest}"
+        assert get_paths(spec)[path]["parameters"] == [
+            self.expected(spec, "pet_id", type="integer"),
+            self.expected(spec, "weight", type="number"),
+            self.expected(spec, "code", type="string", pattern="^(?:[a-z]+)$"),
+            self.expected(spec, "name", type="string"),
+            self.expected(spec, "rest", type="string"),
+        ]
+
+    def test_declared_parameters_are_kept(self, spec):
+        app = Bottle()
+
+        @app.route("/pets/<pet_id:int>")
+        def pet(pet_id):
+            pass
+
+        declared = {"in": "path", "name": "pet_id", "required": True}
+        spec.path(view=pet, app=app, parameters=[declared])
+        assert get_paths(spec)["/pets/{pet_id}"]["parameters"] == [declared]
+
+    def test_shared_between_major_versions(self):
+        plugin = BottlePlugin(path_parameters=True)
+        APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version="2.0",
+            plugins=(plugin,),
+        )
+        with pytest.raises(APISpecError, match="cannot be shared"):
+            APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.2",
+                plugins=(plugin,),
+            )
+
+    def test_shared_within_major_version(self):
+        plugin = BottlePlugin(path_parameters=True)
+        for openapi_version in ("3.0.2", "3.1.0"):
+            APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version=openapi_version,
+                plugins=(plugin,),
+            )
+        # Without path parameters, nothing depends on the version
+        plugin = BottlePlugin()
+        for openapi_version in ("2.0", "3.0.2"):
+            APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version=openapi_version,
+                plugins=(plugin,),
+            )
+
+    def test_shared_between_threads(self):
+        app = Bottle()
+
+        @app.route("/pets/<pet_id:int>")
+        def pet(pet_id):
+            pass
+
+        plugin = BottlePlugin(path_parameters=True)
+
+        def build(index):
+            try:
+                spec = APISpec(
+                    title="Swagger Petstore",
+                    version="1.0.0",
+                    openapi_version=("2.0", "3.0.2")[index % 2],
+                    plugins=(plugin,),
+                )
+            except APISpecError:
+                return None
+            spec.path(view=pet, app=app)
+            parameters = get_paths(spec)["/pets/{pet_id}"]["parameters"]
+            assert parameters == [self.expected(spec, "pet_id", type="integer")]
+            return spec.openapi_version.major
+
+        majors = set(run_concurrently(build))
+        assert majors == {None, plugin.openapi_version.major}
+
+
+class TestRouteRecords:
+    def test_route_records(self):
+        app = Bottle()
+
+        @app.route("/pets/<pet_id:int>/toys/<toy>", method=["GET", "PUT"], name="toy")
+        def pet_toy(pet_id, toy):
+            """Toy of a pet."""
+
+        records = list(BottlePlugin().route_records(app))
+        assert [record.methods for record in records] == [("get",), ("put",)]
+        record = records[0]
+        assert record.rule == "/pets/<pet_id:int>/toys/<toy>"
+        assert record.path == "/pets/{pet_id}/toys/{toy}"
+        assert record.handler is pet_toy
+        assert record.parameters == ("pet_id", "toy")
+        assert record.endpoint == "toy"
+
+    def test_any_method(self, spec):
+        app = Bottle()
+
+        @app.route("/any", method="ANY")
+        def any_method():
+            """---
+            get:
+                description: get anything
+            post:
+                description: post anything
+            """
+
+        (record,) = BottlePlugin().route_records(app)
+        assert record.methods == tuple(sorted(yaml_utils.PATH_KEYS))
+        spec.path(record=RouteFilter(methods=["GET"])(record))
+        assert get_paths(spec)["/any"] == {"get": {"description": "get anything"}}
+        spec.path(record=record)
+        assert get_paths(spec)["/any"] == {
+            "get": {"description": "get anything"},
+            "post": {"description": "post anything"},
+        }
+
+    def test_path_from_record(self, spec):
+        app = Bottle()
+
+        @app.route("/hello")
+        def hello():
+            """Greeting.
+            ---
+            get:
+                description: get a greeting
+            """
+
+        (record,) = BottlePlugin().route_records(app)
+        spec.path(record=record)
+        assert get_paths(spec)["/hello"] == {"get": {"description": "get a greeting"}}
+
+
+class TestCapture:
+    def test_captures_routes_as_declared(self, spec):
+        app = Bottle()
+
+        @app.route("/before")
+        def before():
+            """---
+            get:
+                description: declared before capture
+            """
+
+        registry = spec.plugins[0].capture(app)
+
+        @app.route("/pets/<pet_id:int>")
+        def pet(pet_id):
+            """---
+            get:
+                description: get a pet
+            """
+
+        toys = Bottle()
+
+        @toys.route("/toys", method=["GET", "POST"])
+        def toy():
+            """---
+            post:
+                description: add a toy
+            """
+
+        app.merge(toys)
+
+        assert [(record.path, record.methods) for record in registry.records] == [
+            ("/before", ("get",)),
+            ("/pets/{pet_id}", ("get",)),
+            ("/toys", ("get",)),
+            ("/toys", ("post",)),
+        ]
+        registry.register(spec)
+        paths = get_paths(spec)
+        assert paths["/pets/{pet_id}"] == {"get": {"description": "get a pet"}}
+        assert paths["/toys"] == {"post": {"description": "add a toy"}}
+
+    def test_registers_routes_incrementally(self, spec):
+        app = Bottle()
+        registry = spec.plugins[0].capture(app)
+        app.route("/hello", callback=lambda: "hello")
+        registry.register(spec)
+        app.route("/bye", callback=lambda: "bye")
+        registry.register(spec)
+        assert [record.path for record in registry.records] == ["/hello", "/bye"]
+        assert list(get_paths(spec)) == ["/hello", "/bye"]
+
+
+class TestConcurrency:
+    def test_shared_plugin_concurrent_path_helpers(self):
+        app = Bottle()
+        plugin = BottlePlugin()
+        views = []
+
+        for i in range(10):
+
+            def view(pet_id):
+                """A pet.
+                ---
+                get:
+                    responses:
+                        200:
+                            description: a pet
+                """
+
+            app.route(f"/pets{i}/<pet_id:int>", callback=view)
+            views.append(view)
+
+        def build(index):
+            spec = APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.0",
+                plugins=(plugin,),
+            )
+            for view in views:
+                spec.path(view=view, app=app)
+            return get_paths(spec)
+
+        results = run_concurrently(build)
+        assert len(results[0]) == 10
+        assert results[0]["/pets3/{pet_id}"]["get"] == {
+            "responses": {"200": {"description": "a pet"}}
+        }
+        assert all(result == results[0] for result in results)
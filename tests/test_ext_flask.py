@@ -1,11 +1,20 @@
+import gzip
+import json
+
 import pytest
-from apispec import APISpec
-from flask import Flask
+import yaml
+from apispec import APISpec, yaml_utils
+from apispec.exceptions import APISpecError
+from flask import Blueprint, Flask
 from flask.views import MethodView
+from werkzeug.routing import BaseConverter
 
-from apispec_webframeworks.flask import FlaskPlugin
+from apispec_webframeworks.docs import doc
+from apispec_webframeworks.flask import FlaskPlugin, spec_blueprint
+from apispec_webframeworks.routes import RouteFilter
+from apispec_webframeworks.serving import MappedSpec, write_spec
 
-from .utils import get_paths
+from .utils import get_paths, run_concurrently
 
 
 @pytest.fixture(params=("2.0", "3.0.0"))
@@ -180,3 +189,545 @@ class TestPathHelpers:
 
         spec.path(view=get_pet, app=app)
         assert "/pet/{pet_id}" in get_paths(spec)
+
+    def test_path_from_decorated_view(self, app, spec, monkeypatch):
+        monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", None)
+
+        @app.route("/hello")
+        @doc(get={"description": "get a greeting"}, **{"x-extension": "value"})
+        def hello():
+            return "hi"
+
+        spec.path(view=hello)
+        assert get_paths(spec)["/hello"] == {
+            "get": {"description": "get a greeting"},
+            "x-extension": "value",
+        }
+
+    def test_path_from_decorated_method_view(self, app, spec, monkeypatch):
+        monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", None)
+
+        @doc(**{"x-extension": "global metadata"})
+        class HelloApi(MethodView):
+            @doc(description="get a greeting")
+            def get(self):
+                return "hi"
+
+            @doc()
+            def post(self):
+                return "hi"
+
+        method_view = HelloApi.as_view("hi")
+        app.add_url_rule("/hi", view_func=method_view, methods=("GET", "POST"))
+        spec.path(view=method_view)
+        assert get_paths(spec)["/hi"] == {
+            "get": {"description": "get a greeting"},
+            "post": {},
+            "x-extension": "global metadata",
+        }
+
+
+class TestPathParameters:
+    @pytest.fixture(params=("2.0", "3.0.0"))
+    def spec(self, request):
+        return APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version=request.param,
+            plugins=(FlaskPlugin(path_parameters=True),),
+        )
+
+    @staticmethod
+    def expected(spec, name, **schema):
+        if spec.openapi_version.major < 3:
+            return {"in": "path", "name": name, "required": True, **schema}
+        return {"in": "path", "name": name, "required": True, "schema": schema}
+
+    def test_parameters_from_converters(self, app, spec):
+        app.url_map.converters["custom"] = BaseConverter
+        rule = (
+            "/pets/<int(min=1):pet_id>/<float:weight>/<uuid:tag>/<any(a, b):kind>"
+            "/<string(length=2):code>/<name>/<path:rest>/<custom:other>"
+        )
+
+        @app.route(rule)
+        def pet(**kwargs):
+            pass
+
+        spec.path(view=pet)
+        path = "/pets/{pet_id}/{weight}/{tag}/{kind}/{code}/{name}/{rest}/{other}"
+        assert get_paths(spec)[path]["parameters"] == [
+            self.expected(spec, "pet_id", type="integer", minimum=1),
+            self.expected(spec, "weight", type="number", minimum=0),
+            self.expected(spec, "tag", type="string", format="uuid"),
+            self.expected(spec, "kind", type="string", enum=["a", "b"]),
+            self.expected(spec, "code", type="string", minLength=2, maxLength=2),
+            self.expected(spec, "name", type="string", minLength=1),
+            self.expected(spec, "rest", type="string"),
+            self.expected(spec, "other", type="string"),
+        ]
+
+    def test_positional_converter_arguments(self, app, spec):
+        rule = (
+            "/pets/<int(4):pet_id>/<int(2, 1, 50):age>/<float(1.5):weight>"
+            "/<string(3):code>"
+        )
+
+        @app.route(rule)
+        def pet(**kwargs):
+            pass
+
+        spec.path(view=pet)
+        path = "/pets/{pet_id}/{age}/{weight}/{code}"
+        assert get_paths(spec)[path]["parameters"] == [
+            self.expected(spec, "pet_id", type="integer", minimum=0, maximum=9999),
+            self.expected(spec, "age", type="integer", minimum=1, maximum=50),
+            self.expected(spec, "weight", type="number", minimum=1.5),
+            self.expected(spec, "code", type="string", minLength=3),
+        ]
+
+    def test_declared_parameters_are_kept(self, app, spec):
+        @app.route("/pets/<int:pet_id>/<toy>")
+        def pet(pet_id, toy):
+            pass
+
+        declared = {"in": "path", "name": "pet_id", "required": True}
+        spec.path(view=pet, parameters=[declared])
+        assert get_paths(spec)["/pets/{pet_id}/{toy}"]["parameters"] == [
+            declared,
+            self.expected(spec, "toy", type="string", minLength=1),
+        ]
+
+    def test_parameters_from_record_are_cached(self, app, spec):
+        @app.route("/pets/<int:pet_id>")
+        def pet(pet_id):
+            pass
+
+        (plugin,) = spec.plugins
+        (record,) = plugin.route_records(app, RouteFilter(endpoints=["pet"]))
+        spec.path(record=record)
+        spec.path(view=pet)
+        assert get_paths(spec)["/pets/{pet_id}"]["parameters"] == [
+            self.expected(spec, "pet_id", type="integer", minimum=0)
+        ]
+        assert len(plugin._path_parameters) == 1
+
+    def test_shared_between_major_versions(self):
+        plugin = FlaskPlugin(path_parameters=True)
+        APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version="2.0",
+            plugins=(plugin,),
+        )
+        with pytest.raises(APISpecError, match="cannot be shared"):
+            APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.2",
+                plugins=(plugin,),
+            )
+
+    def test_shared_within_major_version(self):
+        plugin = FlaskPlugin(path_parameters=True)
+        for openapi_version in ("3.0.2", "3.1.0"):
+            APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version=openapi_version,
+                plugins=(plugin,),
+            )
+        # Without path parameters, nothing depends on the version
+        plugin = FlaskPlugin()
+        for openapi_version in ("2.0", "3.0.2"):
+            APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version=openapi_version,
+                plugins=(plugin,),
+            )
+
+    def test_shared_between_threads(self, app):
+        @app.route("/pets/<int:pet_id>")
+        def pet(pet_id):
+            pass
+
+        plugin = FlaskPlugin(path_parameters=True)
+
+        def build(index):
+            try:
+                spec = APISpec(
+                    title="Swagger Petstore",
+                    version="1.0.0",
+                    openapi_version=("2.0", "3.0.2")[index % 2],
+                    plugins=(plugin,),
+                )
+            except APISpecError:
+                return None
+            spec.path(view=pet, app=app)
+            parameters = get_paths(spec)["/pets/{pet_id}"]["parameters"]
+            assert parameters == [
+                self.expected(spec, "pet_id", type="integer", minimum=0)
+            ]
+            return spec.openapi_version.major
+
+        majors = set(run_concurrently(build))
+        assert majors == {None, plugin.openapi_version.major}
+
+    def test_disabled_by_default(self, app):
+        @app.route("/pets/<int:pet_id>")
+        def pet(pet_id):
+            pass
+
+        spec = APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version="3.0.2",
+            plugins=(FlaskPlugin(),),
+        )
+        spec.path(view=pet)
+        assert "parameters" not in get_paths(spec)["/pets/{pet_id}"]
+
+
+class TestRouteRecords:
+    def test_route_records(self, app):
+        @app.route("/pets/<int:pet_id>/toys/<toy>", methods=["GET", "PUT"])
+        def pet_toy(pet_id, toy):
+            """Toy of a pet."""
+
+        records = {record.endpoint: record for record in FlaskPlugin().route_records()}
+        record = records["pet_toy"]
+        assert record.rule == "/pets/<int:pet_id>/toys/<toy>"
+        assert record.path == "/pets/{pet_id}/toys/{toy}"
+        assert record.methods == ("get", "head", "options", "put")
+        assert record.handler is pet_toy
+        assert record.parameters == ("pet_id", "toy")
+
+    def test_path_from_record(self, app, spec):
+        class HelloApi(MethodView):
+            def get(self):
+                """A greeting endpoint.
+                ---
+                description: get a greeting
+                """
+
+            def delete(self):
+                pass
+
+        app.add_url_rule("/hi", view_func=HelloApi.as_view("hi"), methods=("GET",))
+        (record,) = (
+            record
+            for record in FlaskPlugin().route_records(app)
+            if record.endpoint == "hi"
+        )
+        spec.path(record=record)
+        assert get_paths(spec)["/hi"] == {"get": {"description": "get a greeting"}}
+
+    def test_filtered_route_records(self, app, spec):
+        public = Blueprint("public", __name__)
+        internal = Blueprint("internal", __name__)
+
+        @public.route("/pets", methods=["GET", "POST"])
+        def pets():
+            """Pets.
+            ---
+            get:
+                description: list pets
+            post:
+                description: create a pet
+            """
+
+        @internal.route("/stats")
+        def stats():
+            pass
+
+        app.register_blueprint(public)
+        app.register_blueprint(internal)
+        route_filter = RouteFilter(exclude_blueprints=["internal", ""], methods=["get"])
+        records = list(FlaskPlugin().route_records(app, route_filter=route_filter))
+        assert [(record.path, record.methods) for record in records] == [
+            ("/pets", ("get",))
+        ]
+        spec.path(record=records[0])
+        assert get_paths(spec) == {"/pets": {"get": {"description": "list pets"}}}
+
+
+class TestCapture:
+    def test_captures_routes_as_declared(self, spec):
+        app = Flask(__name__)
+
+        @app.route("/before")
+        def before():
+            """---
+            get:
+                description: declared before capture
+            """
+
+        plugin = spec.plugins[0]
+        registry = plugin.capture(app)
+
+        @app.route("/pets/<int:pet_id>", methods=["GET", "PUT"])
+        def pet(pet_id):
+            """---
+            get:
+                description: get a pet
+            """
+
+        class ToyApi(MethodView):
+            def get(self):
+                """---
+                description: get toys
+                """
+
+        blueprint = Blueprint("toys", __name__)
+        blueprint.add_url_rule("/toys", view_func=ToyApi.as_view("toys"))
+        app.register_blueprint(blueprint, url_prefix="/v1")
+
+        assert [record.path for record in registry.records] == [
+            "/static/{filename}",
+            "/before",
+            "/pets/{pet_id}",
+            "/v1/toys",
+        ]
+        assert registry.records[2].handler is pet
+        assert registry.records[3].endpoint == "toys.toys"
+
+        registry.register(spec)
+        paths = get_paths(spec)
+        assert paths["/pets/{pet_id}"] == {"get": {"description": "get a pet"}}
+        assert paths["/v1/toys"] == {"get": {"description": "get toys"}}
+
+    def test_registers_routes_incrementally(self, spec, parsed_docstrings):
+        app = Flask(__name__, static_folder=None)
+        registry = spec.plugins[0].capture(app)
+
+        @app.route("/hello")
+        def hello():
+            """---
+            get:
+                description: get a greeting
+            """
+
+        registry.register(spec)
+        assert list(get_paths(spec)) == ["/hello"]
+
+        @app.route("/bye")
+        def bye():
+            """---
+            get:
+                description: say goodbye
+            """
+
+        registry.register(spec)
+        assert list(get_paths(spec)) == ["/hello", "/bye"]
+        assert len(parsed_docstrings) == 2
+
+    def test_captures_views_mapped_later(self, spec):
+        app = Flask(__name__, static_folder=None)
+        registry = spec.plugins[0].capture(app)
+        app.add_url_rule("/hello", "hello")
+        assert registry.records == ()
+
+        @app.endpoint("hello")
+        def hello():
+            """---
+            get:
+                description: get a greeting
+            """
+
+        assert [record.handler for record in registry.records] == [hello]
+        registry.register(spec)
+        assert get_paths(spec)["/hello"] == {"get": {"description": "get a greeting"}}
+
+    def test_captures_concurrent_declarations(self, spec):
+        app = Flask(__name__, static_folder=None)
+        registry = spec.plugins[0].capture(app)
+        counter = iter(range(1000))
+
+        def declare(index):
+            i = next(counter)
+            app.add_url_rule(f"/pets{i}", f"pets{i}", view_func=lambda: "pet")
+
+        run_concurrently(declare)
+        assert len(registry.records) == len(app.view_functions) == 200
+        assert len({record.path for record in registry.records}) == 200
+
+    def test_register_does_not_hold_the_registry(self, spec):
+        app = Flask(__name__, static_folder=None)
+        registry = spec.plugins[0].capture(app)
+        app.add_url_rule("/hello", view_func=lambda: "hello", endpoint="hello")
+
+        def declare_more(record):
+            # E.g. another thread declaring routes during registration
+            if record.path == "/hello":
+                app.add_url_rule("/bye", view_func=lambda: "bye", endpoint="bye")
+            return True
+
+        registry.register(spec, RouteFilter(predicate=declare_more))
+        assert list(get_paths(spec)) == ["/hello"]
+        registry.register(spec)
+        assert list(get_paths(spec)) == ["/hello", "/bye"]
+
+    def test_captured_routes_are_not_scanned(self, spec, monkeypatch):
+        app = Flask(__name__)
+        registry = spec.plugins[0].capture(app)
+
+        @app.route("/hello")
+        def hello():
+            """---
+            get:
+                description: get a greeting
+            """
+
+        def fail(*args, **kwargs):
+            raise AssertionError("routes were scanned")
+
+        monkeypatch.setattr(FlaskPlugin, "_rule_for_view", fail)
+        monkeypatch.setattr(FlaskPlugin, "route_records", fail)
+        registry.register(spec)
+        assert "/hello" in get_paths(spec)
+
+
+class TestSpecBlueprint:
+    @pytest.fixture
+    def builds(self):
+        return []
+
+    @pytest.fixture
+    def client(self, builds):
+        app = Flask(__name__)
+
+        @app.route("/pets")
+        def pets():
+            """Pets.
+            ---
+            get:
+                description: list pets
+            """
+
+        def create_spec():
+            builds.append(True)
+            spec = APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.2",
+                plugins=(FlaskPlugin(),),
+            )
+            spec.path(view=pets)
+            return spec
+
+        app.register_blueprint(spec_blueprint(create_spec, url_prefix="/api"))
+        return app.test_client()
+
+    def test_serves_json_and_yaml(self, client, builds):
+        response = client.get("/api/openapi.json")
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert response.json["paths"] == {
+            "/pets": {"get": {"description": "list pets"}}
+        }
+        response = client.get("/api/openapi.yaml")
+        assert response.mimetype == "application/yaml"
+        assert yaml.safe_load(response.data)["paths"] == {
+            "/pets": {"get": {"description": "list pets"}}
+        }
+        client.get("/api/openapi.json")
+        assert len(builds) == 1
+
+    def test_gzip(self, client):
+        plain = client.get("/api/openapi.json")
+        response = client.get("/api/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.content_encoding == "gzip"
+        assert gzip.decompress(response.data) == plain.data
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.get_etag()[0] != plain.get_etag()[0]
+
+    def test_if_none_match(self, client):
+        etag = client.get("/api/openapi.json").get_etag()[0]
+        response = client.get("/api/openapi.json", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.get_etag()[0] == etag
+        response = client.get("/api/openapi.json", headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+
+    def test_concurrent_first_requests_build_once(self, client, builds):
+        results = run_concurrently(
+            lambda i: client.get("/api/openapi.json").status_code, n_calls=2
+        )
+        assert set(results) == {200}
+        assert len(builds) == 1
+
+    def test_mapped_spec(self, tmp_path):
+        spec = APISpec(
+            title="Swagger Petstore", version="1.0.0", openapi_version="3.0.2"
+        )
+        path = tmp_path / "openapi.json"
+        write_spec(spec, path)
+        app = Flask(__name__)
+        with MappedSpec(path) as mapped:
+            app.register_blueprint(spec_blueprint(mapped))
+            client = app.test_client()
+            response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+            assert response.status_code == 200
+            assert response.content_encoding is None
+            assert response.content_length == len(mapped)
+            assert json.loads(response.data) == spec.to_dict()
+            response = client.get(
+                "/openapi.json", headers={"If-None-Match": f'"{mapped.etag}"'}
+            )
+            assert response.status_code == 304
+            assert client.get("/openapi.yaml").status_code == 404
+
+    def test_mapped_yaml_spec(self, tmp_path):
+        spec = APISpec(
+            title="Swagger Petstore", version="1.0.0", openapi_version="3.0.2"
+        )
+        path = tmp_path / "openapi.yaml"
+        write_spec(spec, path, fmt="yaml")
+        app = Flask(__name__)
+        with MappedSpec(path) as mapped:
+            app.register_blueprint(spec_blueprint(mapped))
+            client = app.test_client()
+            response = client.get("/openapi.yaml")
+            assert response.status_code == 200
+            assert response.mimetype == "application/yaml"
+            assert yaml.safe_load(response.data) == spec.to_dict()
+            assert client.get("/openapi.json").status_code == 404
+
+
+class TestConcurrency:
+    def test_shared_plugin_concurrent_path_helpers(self):
+        app = Flask(__name__)
+        plugin = FlaskPlugin()
+
+        for i in range(10):
+
+            def view(pet_id):
+                """A pet.
+                ---
+                get:
+                    responses:
+                        200:
+                            description: a pet
+                """
+
+            app.add_url_rule(f"/pets{i}/<int:pet_id>", f"pet{i}", view)
+
+        def build(index):
+            spec = APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.0",
+                plugins=(plugin,),
+            )
+            for i in range(10):
+                spec.path(view=app.view_functions[f"pet{i}"], app=app)
+            return get_paths(spec)
+
+        results = run_concurrently(build)
+        assert len(results[0]) == 10
+        assert results[0]["/pets3/{pet_id}"]["get"] == {
+            "responses": {"200": {"description": "a pet"}}
+        }
+        assert all(result == results[0] for result in results)
@@ -1,11 +1,16 @@
+import gc
+import weakref
+
 import pytest
 import tornado.gen
-from apispec import APISpec
-from tornado.web import RequestHandler
+from apispec import APISpec, yaml_utils
+from apispec.exceptions import APISpecError
+from tornado.web import Application, RequestHandler, URLSpec
 
+from apispec_webframeworks.docs import doc
 from apispec_webframeworks.tornado import TornadoPlugin
 
-from .utils import get_paths
+from .utils import get_paths, run_concurrently
 
 
 @pytest.fixture(params=("2.0", "3.0.0"))
@@ -154,3 +159,158 @@ class TestPathHelpers:
         path = "/helloworld"
         paths = get_paths(spec)
         assert path in paths
+
+    def test_path_from_decorated_handler(self, spec, monkeypatch):
+        monkeypatch.setattr(yaml_utils, "load_yaml_from_docstring", None)
+
+        @doc(**{"x-extension": "value"})
+        class HelloHandler(RequestHandler):
+            @doc(description="get a greeting")
+            def get(self):
+                self.write("hello")
+
+        spec.path(urlspec=(r"/hello", HelloHandler))
+        assert get_paths(spec)["/hello"] == {
+            "get": {"description": "get a greeting"},
+            "x-extension": "value",
+        }
+
+
+class TestPathTemplates:
+    class PetHandler(RequestHandler):
+        def get(self, kind, pet_id=None, extra=None):
+            pass
+
+    @pytest.mark.parametrize(
+        ("pattern", "path"),
+        [
+            # Patterns Tornado cannot reverse
+            (r"/(?:pets)/(\d+)", "/pets/{kind}"),
+            (r"/pets/((?:cat|dog)s?)/(\d+)", "/pets/{kind}/{pet_id}"),
+            # Nested groups are passed to the method too
+            (r"/pets/((cat|dog)s?)/(\d+)", "/pets/{kind}/{extra}"),
+            (r"/pets/(?P<kind>(?:cat|dog))/(?P<pet_id>\d+)/?", "/pets/{kind}/{pet_id}"),
+            # Patterns Tornado can reverse
+            (r"/pets/([^/]+)/?", "/pets/{kind}"),
+            (r"/pets/([^/]+)/*", "/pets/{kind}"),
+            (r"/pets\.json", "/pets.json"),
+            (r"/pets.json", "/pets.json"),
+            (r"/", "/"),
+        ],
+    )
+    def test_path_template(self, spec, pattern, path):
+        spec.path(
+            urlspec=(pattern, self.PetHandler),
+            operations={"get": {"responses": {"200": {}}}},
+        )
+        assert path in get_paths(spec)
+
+    @pytest.mark.parametrize(
+        ("pattern", "reason"),
+        [
+            (r"/x/(?:v1|v2)/(\d+)", "character class or alternation"),
+            (r"/(?:pets|animals)/(?P<pet_id>\d+)", "alternation"),
+            (r"/a/[xy]z", "character class or alternation"),
+            (r"/pets/(?:[a-z]+)/(\d+)", "optional or repeated part"),
+            (r"/opt(?:/(\d+))?", "optional or repeated part"),
+            (r"/opt(/(\d+))?", "optional or repeated part"),
+            (r"/pets/?/(\d+)", "optional or repeated part"),
+            (r"/pets/\d+", "optional or repeated part"),
+        ],
+    )
+    def test_patterns_matching_several_paths(self, spec, pattern, reason):
+        with pytest.raises(APISpecError, match=f"it has an? {reason} outside"):
+            spec.path(
+                urlspec=(pattern, self.PetHandler),
+                operations={"get": {"responses": {"200": {}}}},
+            )
+
+    def test_handlers_are_not_kept_alive(self):
+        class PetHandler(RequestHandler):
+            def get(self, pet_id):
+                pass
+
+        spec = URLSpec(r"/pets/([0-9]+)", PetHandler)
+        assert TornadoPlugin.tornadopath2openapi(spec, PetHandler.get) == (
+            "/pets/{pet_id}"
+        )
+        handler, method = weakref.ref(PetHandler), weakref.ref(PetHandler.get)
+        del spec, PetHandler
+        gc.collect()
+        assert handler() is None
+        assert method() is None
+
+    def test_templates_are_cached_per_pattern(self):
+        pattern = r"/(?:pets)/(?P<pet_id>\d+)"
+        first = TornadoPlugin.path_template(URLSpec(pattern, self.PetHandler))
+        second = TornadoPlugin.path_template(URLSpec(pattern, self.PetHandler))
+        assert first is second
+        assert first.groups == ("pet_id",)
+
+
+class TestRouteRecords:
+    class PetToyHandler(RequestHandler):
+        """Toy of a pet."""
+
+        def get(self, pet_id, toy):
+            """Get a toy.
+            ---
+            description: get a toy
+            """
+
+        def put(self, pet_id, toy):
+            pass
+
+    def test_route_records(self):
+        app = Application(
+            [(r"/pets/([0-9]+)/toys/([^/]+)", self.PetToyHandler, {}, "toy")]
+        )
+        (record,) = TornadoPlugin().route_records(app)
+        assert record.rule == r"/pets/([0-9]+)/toys/([^/]+)$"
+        assert record.path == "/pets/{pet_id}/toys/{toy}"
+        assert record.methods == ("get", "put")
+        assert record.handler is self.PetToyHandler
+        assert record.parameters == ("pet_id", "toy")
+        assert record.endpoint == "toy"
+
+    def test_path_from_record(self, spec):
+        pattern = r"/pets/(?P<pet_id>[0-9]+)/toys/(?P<toy>[^/]+)"
+        urlspecs = [(pattern, self.PetToyHandler)]
+        (record,) = TornadoPlugin().route_records(urlspecs)
+        spec.path(record=record)
+        assert get_paths(spec)["/pets/{pet_id}/toys/{toy}"] == {
+            "get": {"description": "get a toy"}
+        }
+
+
+class TestConcurrency:
+    def test_shared_plugin_concurrent_path_helpers(self):
+        class PetHandler(RequestHandler):
+            def get(self, pet_id):
+                """A pet.
+                ---
+                responses:
+                    200:
+                        description: a pet
+                """
+
+        plugin = TornadoPlugin()
+        urlspecs = [(rf"/pets{i}/([0-9]+)", PetHandler) for i in range(10)]
+
+        def build(index):
+            spec = APISpec(
+                title="Swagger Petstore",
+                version="1.0.0",
+                openapi_version="3.0.0",
+                plugins=(plugin,),
+            )
+            for urlspec in urlspecs:
+                spec.path(urlspec=urlspec)
+            return get_paths(spec)
+
+        results = run_concurrently(build)
+        assert len(results[0]) == 10
+        assert results[0]["/pets3/{pet_id}"]["get"] == {
+            "responses": {"200": {"description": "a pet"}}
+        }
+        assert all(result == results[0] for result in results)
@@ -0,0 +1,93 @@
+import pytest
+from flask import Flask
+
+from apispec_webframeworks.flask import FlaskPlugin
+from apispec_webframeworks.lazy import LazyAPISpec
+
+from .utils import get_paths, run_concurrently
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+
+    @app.route("/pets")
+    def pets():
+        """Pets.
+        ---
+        get:
+            description: list pets
+        """
+
+    @app.route("/toys")
+    def toys():
+        """Toys.
+        ---
+        get:
+            description: list toys
+        """
+
+    return app
+
+
+@pytest.fixture
+def plugin():
+    return FlaskPlugin()
+
+
+@pytest.fixture
+def spec(plugin):
+    return LazyAPISpec(
+        title="Swagger Petstore",
+        version="1.0.0",
+        openapi_version="3.0.2",
+        plugins=(plugin,),
+    )
+
+
+def add_lazy_paths(spec, plugin, app):
+    for record in plugin.route_records(app):
+        if record.endpoint != "static":
+            spec.lazy_path(record=record)
+
+
+class TestLazyAPISpec:
+    def test_docstrings_parsed_on_serialization(
+        self, spec, plugin, app, parsed_docstrings
+    ):
+        add_lazy_paths(spec, plugin, app)
+        assert spec.pending_paths == 2
+        assert parsed_docstrings == []
+
+        paths = get_paths(spec)
+        assert list(paths) == ["/pets", "/toys"]
+        assert paths["/pets"] == {"get": {"description": "list pets"}}
+        assert len(parsed_docstrings) == 2
+        assert spec.pending_paths == 0
+
+        spec.to_yaml()
+        assert len(parsed_docstrings) == 2
+
+    def test_lazy_and_eager_paths(self, spec, app):
+        spec.lazy_path(view=app.view_functions["pets"], app=app)
+        spec.path(view=app.view_functions["toys"], app=app)
+        assert set(get_paths(spec)) == {"/pets", "/toys"}
+
+    def test_failing_path_is_raised_again(self, spec, app):
+        def unknown():
+            pass
+
+        spec.lazy_path(view=app.view_functions["pets"], app=app)
+        spec.lazy_path(view=unknown, app=app)
+        for _ in range(2):
+            with pytest.raises(Exception, match="Could not find endpoint"):
+                spec.to_dict()
+        assert spec.pending_paths == 1
+
+    def test_concurrent_serialization_loads_once(
+        self, spec, plugin, app, parsed_docstrings
+    ):
+        add_lazy_paths(spec, plugin, app)
+        results = run_concurrently(lambda i: get_paths(spec))
+        assert len(parsed_docstrings) == 2
+        assert all(list(paths) == ["/pets", "/toys"] for paths in results)
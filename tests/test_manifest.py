@@ -0,0 +1,162 @@
+import json
+
+from apispec import APISpec
+from flask import Flask
+from flask.views import MethodView
+from tornado.web import RequestHandler
+
+from apispec_webframeworks.docs import doc
+from apispec_webframeworks.flask import FlaskPlugin
+from apispec_webframeworks.manifest import ManifestDiff, RouteManifest
+from apispec_webframeworks.tornado import TornadoPlugin
+
+from .utils import get_paths
+
+
+def make_app(hello_doc="Hello.\n---\nget:\n  description: hello\n"):
+    app = Flask(__name__)
+
+    def hello():
+        return "hi"
+
+    hello.__doc__ = hello_doc
+    app.add_url_rule("/hello", view_func=hello)
+
+    @app.route("/pets/<pet_id>", methods=["GET", "POST"])
+    def pet(pet_id):
+        """Pet.
+        ---
+        get:
+          description: get a pet
+        post:
+          description: update a pet
+        """
+        return pet_id
+
+    return app
+
+
+def manifest_for(app):
+    return RouteManifest.from_records(FlaskPlugin().route_records(app))
+
+
+class TestRouteManifest:
+    def test_hashes_operations(self):
+        manifest = manifest_for(make_app())
+        assert ("/hello", "get") in manifest
+        assert ("/pets/{pet_id}", "post") in manifest
+        assert len(manifest[("/hello", "get")]) == 32
+
+    def test_hashes_are_stable(self):
+        assert manifest_for(make_app()) == manifest_for(make_app())
+        assert manifest_for(make_app()).fingerprint == (
+            manifest_for(make_app()).fingerprint
+        )
+
+    def test_dict_round_trip(self):
+        manifest = manifest_for(make_app())
+        data = json.loads(json.dumps(manifest.to_dict()))
+        assert data["/pets/{pet_id}"].keys() >= {"get", "post"}
+        assert RouteManifest.from_dict(data) == manifest
+
+    def test_compare(self):
+        old = manifest_for(make_app())
+        app = make_app(hello_doc="Hello.\n---\nget:\n  description: changed\n")
+        app.add_url_rule("/bye", view_func=lambda: "bye", endpoint="bye")
+        new = manifest_for(app)
+        diff = old.compare(new)
+        assert diff.changed == {
+            ("/hello", "get"),
+            ("/hello", "head"),
+            ("/hello", "options"),
+        }
+        assert ("/bye", "get") in diff.added
+        assert diff.removed == set()
+        assert new.compare(old).removed == diff.added
+        assert old.fingerprint != new.fingerprint
+
+    def test_compare_identical(self):
+        diff = manifest_for(make_app()).compare(manifest_for(make_app()))
+        assert diff == ManifestDiff(frozenset(), frozenset(), frozenset())
+        assert not diff
+
+    def test_hashes_doc_data(self):
+        def make_handler(description):
+            class PetHandler(RequestHandler):
+                @doc(responses={"200": {"description": description}})
+                def get(self):
+                    pass
+
+                def post(self):
+                    """Post."""
+
+            return PetHandler
+
+        plugin = TornadoPlugin()
+        old = RouteManifest.from_records(
+            plugin.route_records([(r"/pets", make_handler("A pet"))])
+        )
+        new = RouteManifest.from_records(
+            plugin.route_records([(r"/pets", make_handler("Another pet"))])
+        )
+        assert old.compare(new).changed == {("/pets", "get")}
+
+    def test_hashes_doc_data_with_mixed_keys(self):
+        def make_app_with_doc(description):
+            app = Flask(__name__)
+
+            @app.route("/pets")
+            @doc(
+                get={
+                    "responses": {
+                        200: {"description": description},
+                        "default": {"description": "An error"},
+                    }
+                }
+            )
+            def pets():
+                pass
+
+            return app
+
+        old = manifest_for(make_app_with_doc("Pets"))
+        assert old == manifest_for(make_app_with_doc("Pets"))
+        new = manifest_for(make_app_with_doc("All pets"))
+        assert ("/pets", "get") in old.compare(new).changed
+
+    def test_hashes_method_view_methods(self):
+        def make_app_with_view(description):
+            class PetApi(MethodView):
+                def get(self):
+                    pass
+
+                def post(self):
+                    pass
+
+            PetApi.post.__doc__ = f"---\ndescription: {description}\n"
+            app = Flask(__name__)
+            app.add_url_rule("/pets", view_func=PetApi.as_view("pets"))
+            return app
+
+        old = manifest_for(make_app_with_view("create"))
+        new = manifest_for(make_app_with_view("create a pet"))
+        assert old.compare(new).changed == {("/pets", "post")}
+
+
+class TestManifestDiff:
+    def test_generates_changed_operations(self):
+        old = manifest_for(make_app())
+        app = make_app(hello_doc="Hello.\n---\nget:\n  description: changed\n")
+        plugin = FlaskPlugin()
+        records = list(plugin.route_records(app))
+        diff = old.compare(RouteManifest.from_records(records))
+
+        spec = APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version="3.0.2",
+            plugins=(plugin,),
+        )
+        for record in diff.records(records):
+            spec.path(record=record)
+        assert get_paths(spec) == {"/hello": {"get": {"description": "changed"}}}
@@ -0,0 +1,153 @@
+import copy
+import json
+
+import pytest
+from apispec import APISpec
+from flask import Flask
+
+from apispec_webframeworks.flask import FlaskPlugin
+from apispec_webframeworks.pytest_plugin import SpecCache
+
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route("/pets/<pet_id>")
+    def pet(pet_id):
+        """Pet.
+        ---
+        get:
+          parameters:
+            - in: path
+              name: pet_id
+          responses:
+            200:
+              description: A pet
+        """
+        return pet_id
+
+    return app
+
+
+def make_spec(app, calls):
+    def factory():
+        calls.append(app)
+        spec = APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version="3.0.2",
+            plugins=(FlaskPlugin(),),
+        )
+        for record in FlaskPlugin().route_records(app):
+            spec.path(record=record)
+        return spec
+
+    return factory
+
+
+class TestSpecCache:
+    def test_builds_once_per_name(self):
+        cache = SpecCache()
+        app, calls = make_app(), []
+        first = cache.get("petstore", make_spec(app, calls))
+        second = cache.get("petstore", make_spec(app, calls))
+        assert first is second
+        assert len(calls) == 1
+        assert cache.built == ["petstore"]
+
+    def test_view_is_read_only(self):
+        spec = SpecCache().get("petstore", make_spec(make_app(), []))
+        operation = spec["paths"]["/pets/{pet_id}"]["get"]
+        with pytest.raises(TypeError):
+            operation["responses"] = {}
+        with pytest.raises(TypeError):
+            operation["parameters"].append({})
+        with pytest.raises(TypeError):
+            operation["parameters"][0]["name"] = "id"
+
+    def test_view_is_serializable(self):
+        spec = SpecCache().get("petstore", make_spec(make_app(), []))
+        assert json.loads(json.dumps(spec)) == spec
+
+    def test_deepcopy_is_mutable(self):
+        spec = SpecCache().get("petstore", make_spec(make_app(), []))
+        copied = copy.deepcopy(spec)
+        assert copied == spec
+        operation = copied["paths"]["/pets/{pet_id}"]["get"]
+        operation["parameters"].append({"in": "query", "name": "q"})
+        operation["responses"] = {}
+        assert spec["paths"]["/pets/{pet_id}"]["get"]["responses"] != {}
+        assert type(copy.copy(spec)) is dict
+
+    def test_view_equals_json_spec(self):
+        spec = SpecCache().get("petstore", make_spec(make_app(), []))
+        assert spec["paths"]["/pets/{pet_id}"] == {
+            "get": {
+                "parameters": [{"in": "path", "name": "pet_id", "required": True}],
+                "responses": {"200": {"description": "A pet"}},
+            }
+        }
+
+
+TEST_MODULE = """
+import pytest
+from apispec import APISpec
+from flask import Flask
+
+from apispec_webframeworks.flask import FlaskPlugin
+
+pytest_plugins = ["apispec_webframeworks.pytest_plugin"]
+
+
+def build_spec(app):
+    spec = APISpec(
+        title="Swagger Petstore",
+        version="1.0.0",
+        openapi_version="3.0.2",
+        plugins=(FlaskPlugin(),),
+    )
+    for record in FlaskPlugin().route_records(app):
+        spec.path(record=record)
+    return spec
+
+
+@pytest.fixture(scope="session")
+def openapi(apispec_cache):
+    app = Flask(__name__)
+
+    @app.route("/pets")
+    def pets():
+        return "pets"
+
+    pets.__doc__ = {docstring!r}
+    spec = apispec_cache.get(
+        "petstore",
+        lambda: build_spec(app),
+        records=FlaskPlugin().route_records(app),
+    )
+    print("built:", apispec_cache.built)
+    return spec
+
+
+def test_one(openapi):
+    assert "/pets" in openapi["paths"]
+
+
+def test_two(openapi):
+    assert "/pets" in openapi["paths"]
+"""
+
+
+class TestPersistedCache:
+    def run(self, pytester, docstring):
+        pytester.makepyfile(test_spec=TEST_MODULE.format(docstring=docstring))
+        result = pytester.runpytest_subprocess("-s")
+        result.assert_outcomes(passed=2)
+        return result.stdout.str()
+
+    def test_reuses_spec_while_routes_are_unchanged(self, pytester):
+        docstring = "---\nget:\n  description: Pets\n"
+        assert "built: ['petstore']" in self.run(pytester, docstring)
+        assert "built: []" in self.run(pytester, docstring)
+        changed = docstring + "  deprecated: true\n"
+        assert "built: ['petstore']" in self.run(pytester, changed)
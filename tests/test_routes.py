@@ -0,0 +1,195 @@
+import re
+
+import pytest
+from apispec import APISpec
+from flask import Flask
+
+from apispec_webframeworks.flask import FlaskPlugin
+from apispec_webframeworks.routes import RouteFilter, RouteRecord, RouteScan
+
+from .utils import get_paths
+
+
+def handler():
+    """Handler docstring."""
+
+
+class TestRouteRecord:
+    def test_create_normalizes_fields(self):
+        record = RouteRecord.create(
+            rule="/pets/<pet_id>",
+            path="/pets/{pet_id}",
+            methods=["POST", "get", "GET"],
+            handler=handler,
+            parameters=["pet_id"],
+            endpoint="pets",
+        )
+        assert record.methods == ("get", "post")
+        assert record.handler is handler
+        assert record.parameters == ("pet_id",)
+        assert record.endpoint == "pets"
+
+    def test_strings_are_interned(self):
+        path = "".join(["/pets/", "{pet_id}"])
+        first = RouteRecord.create("/a", path, ["GET"], handler, ["pet_id"])
+        second = RouteRecord.create("/b", path[:], ["GET"], handler, ["pet_id"])
+        assert first.path is second.path
+        assert first.parameters[0] is second.parameters[0]
+
+    def test_records_have_no_instance_dict(self):
+        record = RouteRecord.create("/", "/", ["GET"], handler)
+        assert not hasattr(record, "__dict__")
+
+
+def make_record(path, methods=("GET",), endpoint=None):
+    return RouteRecord.create(path, path, methods, handler, endpoint=endpoint)
+
+
+class TestRouteFilter:
+    @pytest.mark.parametrize(
+        ("route_filter", "expected"),
+        [
+            (RouteFilter(), ["/v1/pets", "/v1/internal/stats", "/v2/pets/{pet_id}"]),
+            (RouteFilter(paths=["/v1/*"]), ["/v1/pets", "/v1/internal/stats"]),
+            (
+                RouteFilter(paths=[re.compile(r"/v2/")]),
+                ["/v2/pets/{pet_id}"],
+            ),
+            (
+                RouteFilter(exclude_paths=["*/internal/*", "/v2/*"]),
+                ["/v1/pets"],
+            ),
+            (
+                RouteFilter(paths=["/v1/*"], exclude_paths=["/v1/internal/*"]),
+                ["/v1/pets"],
+            ),
+            # Flags apply to their own pattern
+            (
+                RouteFilter(paths=[re.compile(r"/V\d/PETS", re.I), "/V1/*"]),
+                ["/v1/pets", "/v2/pets/{pet_id}"],
+            ),
+            (
+                RouteFilter(exclude_paths=[re.compile(r"(?i)/V2"), "/V1/PETS"]),
+                ["/v1/pets", "/v1/internal/stats"],
+            ),
+            # Group names may be repeated between patterns
+            (
+                RouteFilter(
+                    paths=[
+                        re.compile(r"/(?P<version>v1)/pets"),
+                        re.compile(r"/(?P<version>v2)/pets"),
+                    ]
+                ),
+                ["/v1/pets", "/v2/pets/{pet_id}"],
+            ),
+        ],
+    )
+    def test_paths(self, route_filter, expected):
+        records = [
+            make_record("/v1/pets"),
+            make_record("/v1/internal/stats"),
+            make_record("/v2/pets/{pet_id}"),
+        ]
+        assert [record.path for record in route_filter.apply(records)] == expected
+
+    def test_methods_are_narrowed(self):
+        record = make_record("/pets", methods=("GET", "HEAD", "OPTIONS", "POST"))
+        assert RouteFilter(exclude_methods=["HEAD", "options"])(record).methods == (
+            "get",
+            "post",
+        )
+        assert RouteFilter(methods=["get", "put"])(record).methods == ("get",)
+        assert RouteFilter(methods=["put"])(record) is None
+
+    def test_unchanged_record_is_returned_as_is(self):
+        record = make_record("/pets")
+        assert RouteFilter(exclude_methods=["head"])(record) is record
+
+    def test_endpoints_and_blueprints(self):
+        records = [
+            make_record("/pets", endpoint="pets.list"),
+            make_record("/admin/stats", endpoint="admin.stats"),
+            make_record("/nested", endpoint="admin.nested.view"),
+            make_record("/", endpoint="index"),
+        ]
+
+        def endpoints(route_filter):
+            return [record.endpoint for record in route_filter.apply(records)]
+
+        assert endpoints(RouteFilter(endpoints=["pets.*", "index"])) == [
+            "pets.list",
+            "index",
+        ]
+        assert endpoints(RouteFilter(exclude_endpoints=["admin.*"])) == [
+            "pets.list",
+            "index",
+        ]
+        assert endpoints(RouteFilter(blueprints=["admin"])) == ["admin.stats"]
+        assert endpoints(RouteFilter(exclude_blueprints=["admin", ""])) == [
+            "pets.list",
+            "admin.nested.view",
+        ]
+
+    def test_predicate(self):
+        records = [make_record("/pets"), make_record("/toys")]
+        route_filter = RouteFilter(predicate=lambda record: "pets" in record.path)
+        assert [record.path for record in route_filter.apply(records)] == ["/pets"]
+
+    def test_select_operations(self):
+        record = make_record("/pets", methods=("GET",))
+        operations = {"get": {}, "post": {}, "x-extension": "value"}
+        assert record.select_operations(operations) == {
+            "get": {},
+            "x-extension": "value",
+        }
+
+
+class TestRouteScan:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+
+        for version in ("v1", "v2"):
+
+            def pets():
+                """Pets.
+                ---
+                get:
+                    responses:
+                        200:
+                            description: pets
+                """
+
+            app.add_url_rule(f"/{version}/pets", f"{version}_pets", pets)
+        return app
+
+    @staticmethod
+    def make_spec(openapi_version):
+        return APISpec(
+            title="Swagger Petstore",
+            version="1.0.0",
+            openapi_version=openapi_version,
+            plugins=(FlaskPlugin(),),
+        )
+
+    def test_variants_parse_docstrings_once(self, app, parsed_docstrings):
+        scan = RouteScan(
+            FlaskPlugin().route_records(app, RouteFilter(exclude_endpoints=["static"]))
+        )
+        specs = {
+            (openapi_version, api_version): scan.register(
+                self.make_spec(openapi_version),
+                route_filter=RouteFilter(paths=[f"/{api_version}/*"]),
+            )
+            for openapi_version in ("2.0", "3.0.2")
+            for api_version in ("v1", "v2")
+        }
+        assert len(parsed_docstrings) == 1
+        assert list(get_paths(specs["3.0.2", "v2"])) == ["/v2/pets"]
+
+        # Same as building each spec the usual way
+        for (openapi_version, api_version), spec in specs.items():
+            expected = self.make_spec(openapi_version)
+            with app.test_request_context():
+                expected.path(view=app.view_functions[f"{api_version}_pets"])
+            assert spec.to_dict() == expected.to_dict()
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+import yaml
+from apispec import APISpec
+
+from apispec_webframeworks import serialization
+from apispec_webframeworks.serialization import serialize, to_json, to_yaml
+
+
+@pytest.fixture
+def spec():
+    spec = APISpec(title="Swagger Petstore", version="1.0.0", openapi_version="3.0.2")
+    spec.path(
+        path="/pets/{pet_id}",
+        operations={
+            "get": {
+                "summary": "Détail d'un animal",
+                "responses": {200: {"description": "A pet"}, "default": {}},
+            }
+        },
+    )
+    return spec
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+class TestToJson:
+    def test_minified(self, spec, json_encoder):
+        data = to_json(spec.to_dict())
+        assert json.loads(data) == json.loads(json.dumps(spec.to_dict()))
+        assert b", " not in data
+        assert b": " not in data
+        assert "Détail".encode() in data
+
+    def test_canonical(self, spec, json_encoder):
+        data = to_json(spec.to_dict(), canonical=True)
+        assert data == json.dumps(
+            json.loads(data), separators=(",", ":"), sort_keys=True, ensure_ascii=False
+        ).encode("utf-8")
+        assert data.index(b'"200"') < data.index(b'"default"')
+
+    def test_falls_back_to_json(self, json_encoder):
+        data = {"x-big": 2**70}
+        assert to_json(data) == b'{"x-big":1180591620717411303424}'
+
+    def test_encoders_agree(self, spec, monkeypatch):
+        pytest.importorskip("orjson")
+        fast = to_json(spec.to_dict(), canonical=True)
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert to_json(spec.to_dict(), canonical=True) == fast
+
+
+class TestToYaml:
+    def test_equivalent_to_apispec(self, spec):
+        spec.options["info"] = {"description": "A long\n" + "description " * 20}
+        data = to_yaml(spec.to_dict())
+        assert yaml.safe_load(data) == yaml.safe_load(spec.to_yaml())
+        assert list(yaml.safe_load(data)) == list(spec.to_dict())
+
+    def test_canonical(self, spec):
+        data = to_yaml(spec.to_dict(), canonical=True)
+        assert yaml.safe_load(data)["paths"]["/pets/{pet_id}"]["get"]["responses"] == {
+            "200": {"description": "A pet"},
+            "default": {},
+        }
+        assert data.index(b"info:") < data.index(b"openapi:") < data.index(b"paths:")
+
+
+class TestSerialize:
+    @pytest.mark.parametrize("fmt", ["json", "yaml"])
+    def test_spec_or_dict(self, spec, fmt):
+        assert serialize(spec, fmt) == serialize(spec.to_dict(), fmt)
+
+    def test_unsupported_format(self, spec):
+        with pytest.raises(ValueError, match="Unsupported spec format"):
+            serialize(spec, "xml")
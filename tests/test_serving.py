@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+import yaml
+from apispec import APISpec
+
+from apispec_webframeworks.serving import MappedSpec, write_spec
+
+
+@pytest.fixture
+def spec():
+    spec = APISpec(title="Swagger Petstore", version="1.0.0", openapi_version="3.0.2")
+    spec.path("/pets", operations={"get": {"responses": {"200": {}}}})
+    return spec
+
+
+class TestWriteSpec:
+    def test_write_json(self, spec, tmp_path):
+        path = tmp_path / "openapi.json"
+        write_spec(spec, path)
+        assert json.loads(path.read_bytes()) == spec.to_dict()
+
+    def test_write_yaml(self, spec, tmp_path):
+        path = tmp_path / "openapi.yaml"
+        write_spec(spec, path, fmt="yaml")
+        assert yaml.safe_load(path.read_text()) == spec.to_dict()
+
+    def test_replaces_existing_file(self, spec, tmp_path):
+        path = tmp_path / "openapi.json"
+        path.write_text("stale")
+        write_spec(spec, path)
+        assert json.loads(path.read_bytes()) == spec.to_dict()
+        assert os.listdir(tmp_path) == ["openapi.json"]
+
+    def test_unsupported_format(self, spec, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported"):
+            write_spec(spec, tmp_path / "openapi.xml", fmt="xml")
+
+
+class TestMappedSpec:
+    def test_maps_file(self, spec, tmp_path):
+        path = tmp_path / "openapi.json"
+        write_spec(spec, path)
+        with MappedSpec(path) as mapped:
+            assert mapped.buffer.readonly
+            assert len(mapped) == path.stat().st_size
+            assert json.loads(bytes(mapped.buffer)) == spec.to_dict()
+
+    @pytest.mark.parametrize(
+        ("name", "fmt", "expected"),
+        [
+            ("openapi.json", None, "json"),
+            ("openapi.yaml", None, "yaml"),
+            ("openapi.YML", None, "yaml"),
+            ("openapi", None, "json"),
+            ("openapi", "yaml", "yaml"),
+        ],
+    )
+    def test_format(self, spec, tmp_path, name, fmt, expected):
+        path = tmp_path / name
+        write_spec(spec, path, fmt=expected)
+        with MappedSpec(path, fmt=fmt) as mapped:
+            assert mapped.fmt == expected
+            assert mapped.mimetype == f"application/{expected}"
+
+    def test_unsupported_format(self, spec, tmp_path):
+        path = tmp_path / "openapi.json"
+        write_spec(spec, path)
+        with pytest.raises(ValueError, match="Unsupported"):
+            MappedSpec(path, fmt="xml")
+
+    def test_etag_depends_on_content(self, spec, tmp_path):
+        write_spec(spec, tmp_path / "a.json")
+        write_spec(spec, tmp_path / "b.json")
+        spec.path("/toys", operations={"get": {"responses": {"200": {}}}})
+        write_spec(spec, tmp_path / "c.json")
+        with (
+            MappedSpec(tmp_path / "a.json") as a,
+            MappedSpec(tmp_path / "b.json") as b,
+            MappedSpec(tmp_path / "c.json") as c,
+        ):
+            assert a.etag == b.etag
+            assert a.etag != c.etag
+
+    def test_iter_chunks(self, spec, tmp_path):
+        path = tmp_path / "openapi.json"
+        write_spec(spec, path)
+        with MappedSpec(path) as mapped:
+            chunks = list(mapped.iter_chunks(chunk_size=16))
+        assert all(len(chunk) == 16 for chunk in chunks[:-1])
+        assert b"".join(chunks) == path.read_bytes()
@@ -1,5 +1,8 @@
 """Utilities to get elements of generated spec"""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 
 def get_definitions(spec):
     if spec.openapi_version.major < 3:
@@ -9,3 +12,19 @@ def get_definitions(spec):
 
 def get_paths(spec):
     return spec.to_dict()["paths"]
+
+
+def run_concurrently(func, n_threads=8, n_calls=25):
+    """Call ``func(thread_index)`` ``n_calls`` times from each of ``n_threads``
+    threads started together, returning all results and re-raising the first
+    exception.
+    """
+    barrier = threading.Barrier(n_threads)
+
+    def worker(index):
+        barrier.wait()
+        return [func(index) for _ in range(n_calls)]
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        futures = [executor.submit(worker, i) for i in range(n_threads)]
+        return [result for future in futures for result in future.result()]